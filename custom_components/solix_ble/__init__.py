@@ -1,15 +1,28 @@
 """SolixBLE integration."""
 
+import asyncio
 import logging
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from time import monotonic
+from typing import TypeVar
 
+from bleak.backends.device import BLEDevice
 from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
+    BluetoothScanningMode,
     async_ble_device_from_address,
+    async_register_callback,
     async_scanner_count,
+    async_track_unavailable,
 )
+from homeassistant.components.sensor import SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import CONF_SCAN_INTERVAL, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 from SolixBLE import (
     C300,
     C300DC,
@@ -22,11 +35,42 @@ from SolixBLE import (
     SolixBLEDevice,
 )
 
-from .const import Models
+from . import websocket
+from .const import (
+    CONF_ROTATING,
+    DEFAULT_ROTATING,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    HISTORY_SIZE,
+    Models,
+)
+from .dispatcher import SolixBLEDispatcher
+from .history import SolixBLEHistory
+from .sensor import SENSORS_BY_MODEL
+from .session import async_pop_session
+from .store import SolixBLEStore
+from .supervisor import SolixBLESupervisor
 
 _LOGGER = logging.getLogger(__name__)
 
-type SolixBLEConfigEntry = ConfigEntry[SolixBLEDevice]
+PLATFORMS = [Platform.SENSOR, Platform.SWITCH]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class SolixBLEData:
+    """Runtime data of a config entry."""
+
+    device: SolixBLEDevice
+    dispatcher: SolixBLEDispatcher
+    supervisor: SolixBLESupervisor
+    history: SolixBLEHistory
+
+
+type SolixBLEConfigEntry = ConfigEntry[SolixBLEData]
 
 
 def get_power_station_class(model: Models) -> SolixBLEDevice:
@@ -52,6 +96,12 @@ def get_power_station_class(model: Models) -> SolixBLEDevice:
         raise NotImplementedError(f"Unexpected model. Got: '{type(model)}'!")
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration."""
+    websocket.async_setup(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: SolixBLEConfigEntry) -> bool:
     """Set up the integration from a config entry."""
 
@@ -59,61 +109,152 @@ async def async_setup_entry(hass: HomeAssistant, entry: SolixBLEConfigEntry) ->
     address = entry.unique_id.upper()
     model = Models(entry.data["model"])
 
-    ble_device = async_ble_device_from_address(hass, address, connectable=True)
+    PowerStationClass = get_power_station_class(model)
+
+    # Reuse the session negotiated by the config flow if there is one
+    device = async_pop_session(hass, address, PowerStationClass)
+    handed_off = device is not None
+    found = True
+    if handed_off:
+        _LOGGER.debug("Using session negotiated during config flow for '%s'", address)
+
+    else:
+        ble_device = async_ble_device_from_address(hass, address, connectable=True)
+
+        if ble_device is None:
+            count_scanners = async_scanner_count(hass, connectable=True)
+            _LOGGER.debug("Count of BLE scanners: %i", count_scanners)
 
-    if ble_device is None:
-        count_scanners = async_scanner_count(hass, connectable=True)
-        _LOGGER.debug("Count of BLE scanners: %i", count_scanners)
+            if count_scanners < 1:
+                raise ConfigEntryNotReady(
+                    "No Bluetooth scanners are available to search for the device."
+                )
 
-        if count_scanners < 1:
-            raise ConfigEntryNotReady(
-                "No Bluetooth scanners are available to search for the device."
+            # The device is out of range for now, its entities are added as
+            # unavailable and the supervisor connects once it is heard
+            _LOGGER.debug("Device '%s' not found, waiting for it", address)
+            ble_device = BLEDevice(address, entry.title, None)
+            found = False
+
+        if model is Models.UNKNOWN:
+            _LOGGER.warning(
+                f"The device '{ble_device.name}' is not supported and values will not be available to Home Assistant! "
+                f"However when the integration is in debug mode the raw telemetry data and differences between status "
+                f"updates will be printed in the log and this can be used to aid in adding support for new devices."
             )
-        raise ConfigEntryNotReady("The device was not found.")
 
-    PowerStationClass = get_power_station_class(model)
-    if model is Models.UNKNOWN:
-        _LOGGER.warning(
-            f"The device '{ble_device.name}' is not supported and values will not be available to Home Assistant! "
-            f"However when the integration is in debug mode the raw telemetry data and differences between status "
-            f"updates will be printed in the log and this can be used to aid in adding support for new devices."
-        )
+        # Connecting is left to the supervisor so setup does not wait for it
+        device = PowerStationClass(ble_device)
 
-    device = PowerStationClass(ble_device)
-    try:
-        await device.connect()
-    except Exception as e:
-        raise ConfigEntryNotReady(
-            "Unexpected exception when connecting to device."
-        ) from e
-
-    if not device.connected:
-        raise ConfigEntryNotReady("Device found but unable to connect.")
-
-    if not device.negotiated:
-        raise ConfigEntryNotReady(
-            "Device connected but failed to negotiate encryption."
-        )
+    store = SolixBLEStore(hass, entry.entry_id)
+    await store.async_load()
 
-    entry.runtime_data = device
+    dispatcher = SolixBLEDispatcher(hass, device, store)
+    dispatcher.async_start()
+    supervisor = SolixBLESupervisor(
+        hass,
+        entry,
+        dispatcher,
+        rotating=entry.options.get(CONF_ROTATING, DEFAULT_ROTATING),
+        scan_interval=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        found=found,
+    )
+
+    # Recent readings of every numeric sensor for the websocket API, static
+    # ones are left out so they are not read for every packet again
+    history = SolixBLEHistory(
+        dispatcher,
+        (
+            description.key
+            for description in SENSORS_BY_MODEL.get(PowerStationClass, ())
+            if description.state_class is SensorStateClass.MEASUREMENT
+            and not description.static
+        ),
+        HISTORY_SIZE,
+    )
+    history.async_start()
+    entry.runtime_data = SolixBLEData(device, dispatcher, supervisor, history)
+
+    await _async_timed(
+        entry,
+        "Setting up platforms",
+        hass.config_entries.async_forward_entry_setups(entry, PLATFORMS),
+    )
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
-    await hass.config_entries.async_forward_entry_setups(
-        entry, [Platform.SENSOR, Platform.SWITCH]
+    # Entities start out unavailable and become available once connected
+    supervisor.async_start(connected=handed_off)
+
+    # Reconnect as soon as the device is advertising again rather than
+    # waiting for the next attempt, e.g after it has been power cycled
+    entry.async_on_unload(
+        async_register_callback(
+            hass,
+            supervisor.async_advertisement_received,
+            BluetoothCallbackMatcher(address=address, connectable=True),
+            BluetoothScanningMode.PASSIVE,
+        )
+    )
+    entry.async_on_unload(
+        async_track_unavailable(
+            hass, supervisor.async_device_unavailable, address, connectable=True
+        )
     )
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: SolixBLEConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: SolixBLEConfigEntry) -> bool:
-    """Unload a config entry."""
+    """Unload a config entry.
 
-    unload_ok_sensor = await hass.config_entries.async_forward_entry_unload(
-        entry, Platform.SENSOR
-    )
-    unload_ok_switch = await hass.config_entries.async_forward_entry_unload(
-        entry, Platform.SWITCH
+    Any connection attempt still in progress is abandoned. The platforms
+    are unloaded at the same time as disconnecting from the device, which
+    is safe as the dispatcher is stopped first so no updates will reach
+    entities while they are being removed.
+    """
+
+    await entry.runtime_data.supervisor.async_stop()
+    entry.runtime_data.history.async_stop()
+    entry.runtime_data.dispatcher.async_stop()
+
+    # Saved while the entities and statistics are still tracked, so they
+    # carry on where they left off when the entry is set up again
+    if (store := entry.runtime_data.dispatcher.store) is not None:
+        await store.async_save()
+
+    unload_ok, _ = await asyncio.gather(
+        _async_timed(
+            entry,
+            "Unloading platforms",
+            hass.config_entries.async_unload_platforms(entry, PLATFORMS),
+        ),
+        _async_timed(entry, "Disconnecting", entry.runtime_data.device.disconnect()),
     )
 
-    await entry.runtime_data.disconnect()
+    return unload_ok
 
-    return unload_ok_sensor and unload_ok_switch
+
+async def async_remove_entry(hass: HomeAssistant, entry: SolixBLEConfigEntry) -> None:
+    """Remove the cached device information when a config entry is removed."""
+    await SolixBLEStore(hass, entry.entry_id).async_remove()
+
+
+async def _async_timed(
+    entry: SolixBLEConfigEntry, phase: str, awaitable: Awaitable[_T]
+) -> _T:
+    """Await something and log how long it took.
+
+    :param entry: Config entry the phase belongs to.
+    :param phase: Description of what is being awaited.
+    :param awaitable: The thing to await.
+    """
+    start = monotonic()
+    try:
+        return await awaitable
+    finally:
+        _LOGGER.debug("%s for '%s' took %.3fs", phase, entry.title, monotonic() - start)
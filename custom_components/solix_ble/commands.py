@@ -0,0 +1,196 @@
+"""Serialised sending of commands to a SolixBLE device."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from time import monotonic
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from SolixBLE import SolixBLEDevice
+
+from .const import COMMAND_TIMEOUT, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Command:
+    """A command waiting to be sent."""
+
+    name: str
+    function: Callable[[], Awaitable[None]]
+    future: asyncio.Future[None]
+    queued_at: float = field(default_factory=monotonic)
+    coalesced: int = 0
+
+
+class SolixBLECommandQueue:
+    """Sends commands to a device one at a time.
+
+    Commands are sent in the order they were queued so writes never
+    overlap. A command which is queued for a target, e.g a switch, while
+    another command for the same target is still waiting replaces it, so
+    toggling a switch on, off and on again only sends on. Everyone who
+    queued a replaced command waits for the command which replaced it.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, device: SolixBLEDevice
+    ) -> None:
+        """Initialize the queue.
+
+        :param hass: Home Assistant instance.
+        :param entry: Config entry of the device.
+        :param device: The device to send commands to.
+        """
+        self.hass = hass
+        self.entry = entry
+        self.device = device
+        self._pending: dict[str, _Command] = {}
+        self._task: asyncio.Task | None = None
+        self._listeners: list[Callable[[], None]] = []
+
+        # Time in seconds from queueing the last command until it was sent
+        self.last_latency: float | None = None
+
+        # Time in seconds from queueing the last confirmed command until the
+        # device reported its effect
+        self.last_confirmation_latency: float | None = None
+
+    async def async_send(
+        self, target: str, name: str, function: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Queue a command and wait for it or the command replacing it to be sent.
+
+        :param target: What the command changes, commands for the same
+        target replace each other while waiting.
+        :param name: Name of the command for logging.
+        :param function: Function sending the command.
+        :raises HomeAssistantError: If sending the command failed or timed out.
+        """
+        if (command := self._pending.get(target)) is not None:
+            _LOGGER.debug(
+                "Replacing command '%s' to '%s' with '%s'",
+                command.name,
+                self.device.name,
+                name,
+            )
+            command.name = name
+            command.function = function
+            command.coalesced += 1
+        else:
+            command = self._pending[target] = _Command(
+                name, function, self.hass.loop.create_future()
+            )
+
+        if self._task is None or self._task.done():
+            self._task = self.entry.async_create_background_task(
+                self.hass,
+                self._async_run(),
+                f"{DOMAIN} commands {self.device.address}",
+            )
+
+        # Shielded so one caller giving up does not cancel it for the others
+        await asyncio.shield(command.future)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop sending commands, failing any which are waiting."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for command in self._pending.values():
+            command.future.set_exception(
+                HomeAssistantError(f"Command '{command.name}' was not sent")
+            )
+        self._pending.clear()
+
+    @callback
+    def async_confirmed(self, name: str, latency: float) -> None:
+        """Record that the device has reported the effect of a command.
+
+        :param name: Name of the command for logging.
+        :param latency: Time in seconds since the command was queued.
+        """
+        self.last_confirmation_latency = latency
+        _LOGGER.debug(
+            "Command '%s' to '%s' confirmed after %.3fs",
+            name,
+            self.device.name,
+            latency,
+        )
+        self._async_notify_listeners()
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for commands being sent or confirmed.
+
+        :param update_callback: Function to run when a command was sent or
+        confirmed.
+        :returns: Function which removes the listener.
+        """
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return _remove_listener
+
+    async def _async_run(self) -> None:
+        """Send the waiting commands in order until there are none left."""
+        while self._pending:
+            target = next(iter(self._pending))
+            command = self._pending.pop(target)
+            await self._async_send(command)
+
+    async def _async_send(self, command: _Command) -> None:
+        """Send a command, reporting the result to those waiting for it.
+
+        :param command: The command to send.
+        """
+        try:
+            async with asyncio.timeout(COMMAND_TIMEOUT):
+                await command.function()
+        except asyncio.CancelledError:
+            command.future.set_exception(
+                HomeAssistantError(f"Command '{command.name}' was not sent")
+            )
+            raise
+        except TimeoutError:
+            command.future.set_exception(
+                HomeAssistantError(
+                    f"Command '{command.name}' to '{self.device.name}' "
+                    f"timed out after {COMMAND_TIMEOUT}s"
+                )
+            )
+            return
+        except Exception as err:
+            command.future.set_exception(
+                HomeAssistantError(
+                    f"Command '{command.name}' to '{self.device.name}' failed: {err}"
+                )
+            )
+            return
+
+        self.last_latency = monotonic() - command.queued_at
+        _LOGGER.debug(
+            "Command '%s' to '%s' sent after %.3fs, replacing %i",
+            command.name,
+            self.device.name,
+            self.last_latency,
+            command.coalesced,
+        )
+        command.future.set_result(None)
+        self._async_notify_listeners()
+
+    @callback
+    def _async_notify_listeners(self) -> None:
+        """Run the listeners."""
+        for update_callback in self._listeners:
+            update_callback()
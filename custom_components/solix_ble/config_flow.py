@@ -11,21 +11,50 @@ from homeassistant.components.bluetooth.api import (
     async_ble_device_from_address,
     async_scanner_count,
 )
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_MAC, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_MAC, CONF_NAME, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry, selector
-from SolixBLE import Generic
+from SolixBLE import Generic, SolixBLEDevice
 
 from . import get_power_station_class
-from .const import DOMAIN, Models
+from .const import (
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_PERCENT,
+    CONF_ESTIMATE_WINDOW,
+    CONF_POWER_STATISTICS,
+    CONF_POWER_WRITE_INTERVAL,
+    CONF_ROTATING,
+    CONF_SENSOR_WRITE_INTERVAL,
+    DEFAULT_DEADBAND_ABSOLUTE,
+    DEFAULT_DEADBAND_PERCENT,
+    DEFAULT_ESTIMATE_WINDOW,
+    DEFAULT_POWER_STATISTICS,
+    DEFAULT_ROTATING,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_WRITE_INTERVAL,
+    DOMAIN,
+    Models,
+)
+from .session import async_store_session
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def validate_input(hass: HomeAssistant, address: str, model: Models) -> None:
-    """Validate that we can connect."""
+async def validate_input(
+    hass: HomeAssistant, address: str, model: Models
+) -> SolixBLEDevice:
+    """Validate that we can connect.
+
+    The device is left connected if validation succeeds so that the
+    negotiated session can be handed over to the config entry.
+    """
 
     ble_device = async_ble_device_from_address(hass, address.upper(), connectable=True)
 
@@ -54,8 +83,11 @@ async def validate_input(hass: HomeAssistant, address: str, model: Models) -> No
 
         if not device.negotiated:
             raise CannotNegotiate
-    finally:
+    except BaseException:
         await device.disconnect()
+        raise
+
+    return device
 
 
 class SolixBLEConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -67,6 +99,12 @@ class SolixBLEConfigFlow(ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._discovery_info: bluetooth.BluetoothServiceInfoBleak | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> SolixBLEOptionsFlow:
+        """Create the options flow."""
+        return SolixBLEOptionsFlow()
+
     async def async_step_bluetooth(
         self, discovery_info: bluetooth.BluetoothServiceInfoBleak
     ) -> ConfigFlowResult:
@@ -102,7 +140,7 @@ class SolixBLEConfigFlow(ConfigFlow, domain=DOMAIN):
                 await self.async_set_unique_id(unique_id)
                 self._abort_if_unique_id_configured()
                 model = Models(user_input["device_model"])
-                await validate_input(self.hass, unique_id, model)
+                device = await validate_input(self.hass, unique_id, model)
 
             except CannotConnect:
                 errors["base"] = "cannot_connect"
@@ -116,6 +154,7 @@ class SolixBLEConfigFlow(ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
+                async_store_session(self.hass, device)
                 return self.async_create_entry(
                     title=self._discovery_info.name, data={"model": model.value}
                 )
@@ -140,6 +179,109 @@ class SolixBLEConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+class SolixBLEOptionsFlow(OptionsFlow):
+    """Handle options for SolixBLE."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        seconds = selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                max=3600,
+                step=1,
+                mode=selector.NumberSelectorMode.BOX,
+                unit_of_measurement="s",
+            )
+        )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_POWER_WRITE_INTERVAL,
+                        default=options.get(
+                            CONF_POWER_WRITE_INTERVAL, DEFAULT_WRITE_INTERVAL
+                        ),
+                    ): seconds,
+                    vol.Required(
+                        CONF_SENSOR_WRITE_INTERVAL,
+                        default=options.get(
+                            CONF_SENSOR_WRITE_INTERVAL, DEFAULT_WRITE_INTERVAL
+                        ),
+                    ): seconds,
+                    vol.Required(
+                        CONF_DEADBAND_ABSOLUTE,
+                        default=options.get(
+                            CONF_DEADBAND_ABSOLUTE, DEFAULT_DEADBAND_ABSOLUTE
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0, step="any", mode=selector.NumberSelectorMode.BOX
+                        )
+                    ),
+                    vol.Required(
+                        CONF_DEADBAND_PERCENT,
+                        default=options.get(
+                            CONF_DEADBAND_PERCENT, DEFAULT_DEADBAND_PERCENT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=100,
+                            step="any",
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="%",
+                        )
+                    ),
+                    vol.Required(
+                        CONF_ESTIMATE_WINDOW,
+                        default=options.get(
+                            CONF_ESTIMATE_WINDOW, DEFAULT_ESTIMATE_WINDOW
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=300,
+                            max=86400,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                    vol.Required(
+                        CONF_POWER_STATISTICS,
+                        default=options.get(
+                            CONF_POWER_STATISTICS, DEFAULT_POWER_STATISTICS
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_ROTATING,
+                        default=options.get(CONF_ROTATING, DEFAULT_ROTATING),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=30,
+                            max=86400,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                }
+            ),
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -4,6 +4,85 @@ from enum import Enum
 
 DOMAIN = "solix_ble"
 
+CONF_POWER_WRITE_INTERVAL = "power_write_interval"
+CONF_SENSOR_WRITE_INTERVAL = "sensor_write_interval"
+CONF_DEADBAND_ABSOLUTE = "deadband_absolute"
+CONF_DEADBAND_PERCENT = "deadband_percent"
+CONF_ROTATING = "rotating"
+CONF_POWER_STATISTICS = "power_statistics"
+CONF_ESTIMATE_WINDOW = "estimate_window"
+
+DEFAULT_WRITE_INTERVAL = 0
+DEFAULT_DEADBAND_ABSOLUTE = 0
+DEFAULT_DEADBAND_PERCENT = 0
+DEFAULT_ROTATING = False
+DEFAULT_POWER_STATISTICS = False
+DEFAULT_ESTIMATE_WINDOW = 1800
+DEFAULT_SCAN_INTERVAL = 300
+
+# Longest time in seconds a value suppressed by the deadband can go unwritten
+DEADBAND_MAX_AGE = 60
+
+# Delay in seconds between attempts to connect in the background, doubling
+# after each failed attempt up to the maximum. Each delay is randomly varied
+# by up to this fraction so devices which dropped together do not retry in
+# lockstep
+CONNECT_RETRY_DELAY_MIN = 10
+CONNECT_RETRY_DELAY_MAX = 300
+CONNECT_RETRY_JITTER = 0.2
+
+# Connection slots assumed for adapters which do not report their own, this
+# is the default of ESPHome Bluetooth proxies
+DEFAULT_CONNECTION_SLOTS = 3
+
+# Time in seconds between checks for free slots while devices are waiting
+# for an adapter which is full
+CONNECTION_SLOT_RECHECK_INTERVAL = 30
+
+# Minimum time in seconds between writes of the signal strength, which
+# changes with almost every advertisement
+RSSI_WRITE_INTERVAL = 60
+
+# Time in seconds to wait for telemetry after connecting in rotating mode
+SNAPSHOT_TIMEOUT = 30
+
+# Time in seconds the device is given to reconnect after the connection is
+# lost before its entities are made unavailable
+DISCONNECT_GRACE_PERIOD = 120
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+# Time in seconds between saves of the last known states of the entities,
+# they are also saved when Home Assistant stops
+STATE_SAVE_INTERVAL = 300
+
+# Last known states older than this in seconds are not restored
+STATE_RESTORE_MAX_AGE = 86400
+
+ATTR_STALE = "stale"
+
+# Time in seconds between integrations of steady power into energy
+ENERGY_UPDATE_INTERVAL = 60
+
+# Time in seconds between readings added to the remaining time estimate
+# while the device sends nothing new, so a steady percentage is counted
+ESTIMATE_SAMPLE_INTERVAL = 60
+
+# Number of packets kept in the telemetry history of each device
+HISTORY_SIZE = 7200
+
+# Longest time in seconds sending a single command to the device may take
+COMMAND_TIMEOUT = 10
+
+# Time in seconds a switch waits for the device to report the state it was
+# switched to before going back to the reported state
+SWITCH_CONFIRMATION_TIMEOUT = 30
+
+# Time in seconds the session negotiated during the config flow is kept
+# open for the config entry to use before disconnecting
+SESSION_HANDOFF_TTL = 60
+
 PORT_STATUS_STRINGS = ["Unknown", "Not connected", "Output", "Input"]
 
 CHARGING_STATUS_C300_STRINGS = ["Unknown", "Idle", "Discharging", "Charging"]
@@ -0,0 +1,260 @@
+"""Routing of device state updates to entities for SolixBLE."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from homeassistant.const import EVENT_LOGGING_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from SolixBLE import SolixBLEDevice
+
+from .store import SolixBLEStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SolixBLEDispatcher:
+    """Single subscriber to a device which routes changes to entities.
+
+    Rather than every entity registering its own callback with the device
+    the dispatcher registers one, takes a snapshot of the attributes that
+    entities are subscribed to and only notifies the entities subscribed
+    to attributes which have changed since the previous snapshot. If the
+    availability of the device changes all entities are notified.
+
+    Nothing is read inside the notification handler of the device, it only
+    schedules a single callback on the event loop which takes the snapshot
+    and notifies the affected entities together. Packets which arrive
+    before the callback has run are covered by the same snapshot.
+
+    Static attributes (e.g serial number) are only read until they have
+    been read once while the device is available and again after each
+    connection, keeping them off the per packet path. Their values
+    are kept in the store so they are known before connecting next time.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device: SolixBLEDevice,
+        store: SolixBLEStore | None = None,
+    ) -> None:
+        """Initialize the dispatcher. Does not subscribe to the device.
+
+        :param hass: Home Assistant instance.
+        :param device: The device API object.
+        :param store: Persisted cache of static attributes.
+        """
+        self.hass = hass
+        self.device = device
+        self.store = store
+        self.available: bool = device.available
+        self._snapshot: dict[str, Any] = {}
+
+        # Entities subscribed to each attribute. Entities which are only
+        # interested in availability changes are stored under None.
+        self._subscribers: dict[str | None, list[Callable[[], None]]] = {}
+        self._static_subscribers: dict[str, list[Callable[[], None]]] = {}
+        self._static_pending: set[str] = set()
+
+        # Snapshot and notifications scheduled by the notification handler
+        self._flush_handle: asyncio.Handle | None = None
+
+        # Checking if debug logging is enabled is cached as this runs per packet
+        self._debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        self._packet_time: float = 0
+
+        # Entity updates which left the state unchanged, counted by the
+        # entities so the debug line can show how many writes were skipped
+        self.suppressed_writes = 0
+        self._unsub_logging_changed: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start receiving state updates from the device."""
+        self.device.add_callback(self._state_change_callback)
+        self._unsub_logging_changed = self.hass.bus.async_listen(
+            EVENT_LOGGING_CHANGED, self._async_logging_changed
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop receiving state updates from the device."""
+        self.device.remove_callback(self._state_change_callback)
+        if self._unsub_logging_changed is not None:
+            self._unsub_logging_changed()
+            self._unsub_logging_changed = None
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    @callback
+    def async_subscribe(
+        self,
+        attribute: str | None,
+        update_callback: Callable[[], None],
+        static: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Subscribe to changes of an attribute of the device.
+
+        :param attribute: Name of the attribute or None for availability only.
+        :param update_callback: Function to run when the attribute changes.
+        :param static: If the attribute practically never changes.
+        :returns: Function which removes the subscription.
+        """
+        if static and attribute is not None:
+            subscribers_by_attribute = self._static_subscribers
+            self._static_pending.add(attribute)
+        else:
+            subscribers_by_attribute = self._subscribers
+
+        if attribute is not None:
+            self._snapshot[attribute] = getattr(self.device, attribute)
+        subscribers_by_attribute.setdefault(attribute, []).append(update_callback)
+
+        @callback
+        def _unsubscribe() -> None:
+            subscribers = subscribers_by_attribute[attribute]
+            subscribers.remove(update_callback)
+            if not subscribers:
+                del subscribers_by_attribute[attribute]
+                self._static_pending.discard(attribute)
+                if (
+                    attribute not in self._subscribers
+                    and attribute not in self._static_subscribers
+                ):
+                    self._snapshot.pop(attribute, None)
+
+        return _unsubscribe
+
+    @callback
+    def async_reread_static(self) -> None:
+        """Read the static attributes again with the next packet.
+
+        Called after connecting, as the device may have been updated or
+        had expansion batteries added while disconnected.
+        """
+        self._static_pending.update(self._static_subscribers)
+
+    @callback
+    def async_refresh(self) -> None:
+        """Check the device for changes without waiting for a packet."""
+        self._state_change_callback()
+
+    @callback
+    def _async_logging_changed(self, event: Event | None = None) -> None:
+        """Update the cached debug logging state when the log level changes."""
+        self._debug = _LOGGER.isEnabledFor(logging.DEBUG)
+
+    def get(self, attribute: str) -> Any:
+        """Return the value of an attribute from the latest snapshot.
+
+        Attributes which nothing is subscribed to yet are read from the device.
+
+        :param attribute: Name of the attribute.
+        """
+        try:
+            return self._snapshot[attribute]
+        except KeyError:
+            return getattr(self.device, attribute)
+
+    def _state_change_callback(self) -> None:
+        """Run when device informs of state update. Schedules the snapshot."""
+        if self._flush_handle is None:
+            if self._debug:
+                self._packet_time = perf_counter()
+            self._flush_handle = self.hass.loop.call_soon(self._flush)
+
+    def _take_snapshot(self) -> dict[Callable[[], None], None]:
+        """Read the subscribed attributes from the device into the snapshot.
+
+        :returns: Subscribers of the attributes which have changed, as a
+        dict used as an ordered set.
+        """
+        available = self.device.available
+        availability_changed = available != self.available
+        self.available = available
+
+        changed: dict[Callable[[], None], None] = {}
+        if availability_changed:
+            for subscribers in self._subscribers.values():
+                changed.update(dict.fromkeys(subscribers))
+            for subscribers in self._static_subscribers.values():
+                changed.update(dict.fromkeys(subscribers))
+
+            # Static attributes are checked again after reconnecting
+            if available:
+                self._static_pending.update(self._static_subscribers)
+
+        for attribute, subscribers in self._subscribers.items():
+            if attribute is not None and self._read(attribute):
+                changed.update(dict.fromkeys(subscribers))
+
+        if available and self._static_pending:
+            for attribute in tuple(self._static_pending):
+                if self._read(attribute):
+                    changed.update(dict.fromkeys(self._static_subscribers[attribute]))
+                self._static_pending.discard(attribute)
+
+            if self.store is not None:
+                self.store.async_update_static(
+                    {
+                        attribute: self._snapshot[attribute]
+                        for attribute in self._static_subscribers
+                    }
+                )
+
+        return changed
+
+    def _read(self, attribute: str) -> bool:
+        """Read an attribute from the device into the snapshot.
+
+        :param attribute: Name of the attribute.
+        :returns: True if the value of the attribute has changed.
+        """
+        try:
+            value = getattr(self.device, attribute)
+        except Exception:
+            _LOGGER.exception(
+                "Failed to read attribute '%s' of device %s",
+                attribute,
+                self.device.name,
+            )
+            return False
+
+        if value != self._snapshot[attribute]:
+            self._snapshot[attribute] = value
+            return True
+        return False
+
+    @callback
+    def _flush(self) -> None:
+        """Notify all entities affected by the packets since the last flush."""
+        self._flush_handle = None
+        if not (pending := self._take_snapshot()):
+            return
+        suppressed_writes = self.suppressed_writes
+
+        for update_callback in pending:
+            try:
+                update_callback()
+            except Exception:
+                _LOGGER.exception(
+                    "Exception raised by state change callback '%s'!", update_callback
+                )
+
+        if self.store is not None:
+            self.store.async_schedule_save()
+
+        if self._debug:
+            _LOGGER.debug(
+                "Updated %i entities of device %s in %.2fms, %i unchanged",
+                len(pending),
+                self.device.name,
+                (perf_counter() - self._packet_time) * 1000,
+                self.suppressed_writes - suppressed_writes,
+            )
@@ -0,0 +1,174 @@
+"""Base entity for SolixBLE."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH, DeviceInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
+
+from .const import DEADBAND_MAX_AGE
+from .dispatcher import SolixBLEDispatcher
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SolixBLEEntity(Entity):
+    """Base representation of an entity belonging to a device."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        dispatcher: SolixBLEDispatcher,
+        state_attribute: str | None,
+        min_write_interval: float = 0,
+        static: bool = False,
+    ) -> None:
+        """Initialize the entity. Does not connect.
+
+        :param dispatcher: The dispatcher of the device.
+        :param state_attribute: Name of attribute in API object this entity depends on.
+        :param min_write_interval: Minimum time in seconds between state writes.
+        :param static: If the attribute practically never changes.
+        """
+        device = dispatcher.device
+        self._dispatcher = dispatcher
+        self._state_attribute = state_attribute
+        self._static = static
+        self._min_write_interval = min_write_interval
+        self._device = device
+        self._address = device.address
+
+        # Known before connecting if the device has been connected to before
+        cached = dispatcher.store.static if dispatcher.store is not None else {}
+        self._attr_device_info = DeviceInfo(
+            name=device.name,
+            connections={(CONNECTION_BLUETOOTH, device.address)},
+            serial_number=cached.get("serial_number"),
+            sw_version=cached.get("software_version"),
+        )
+
+        # Last state written to HA, used to skip writes when nothing changed
+        self._last_written_state: tuple[bool, type, Any] | None = None
+        self._last_write_time: float = 0
+
+        # Updates which left the state unchanged so were not written, writes
+        # which were only deferred are not counted
+        self.suppressed_writes = 0
+
+        # Pending write of a deferred state on the trailing edge
+        self._cancel_trailing_write: CALLBACK_TYPE | None = None
+        self._trailing_write_due: float = 0
+
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+        self.async_on_remove(
+            self._dispatcher.async_subscribe(
+                self._state_attribute, self._state_change_callback, self._static
+            )
+        )
+        self.async_on_remove(self._async_cancel_trailing_write)
+        self._update_updatable_attributes()
+        self._last_written_state = self._rendered_state()
+        self._last_write_time = monotonic()
+
+    def _update_updatable_attributes(self) -> None:
+        """Update this entities updatable attrs from the devices state."""
+        raise NotImplementedError
+
+    def _rendered_value(self) -> Any:
+        """Return the value HA will render as the state of this entity."""
+        raise NotImplementedError
+
+    def _rendered_state(self) -> tuple[bool, type, Any]:
+        """Return the availability and value that make up the state of this entity.
+
+        The type is included so that values which compare equal but
+        render differently (e.g 1 and 1.0) are not treated as unchanged.
+        """
+        value = self._rendered_value()
+        return (self._attr_available, type(value), value)
+
+    def _is_significant_change(self, old_value: Any, new_value: Any) -> bool:
+        """Return if a change in value should be written to HA straight away."""
+        return True
+
+    @callback
+    def _async_write_ha_state_if_changed(self) -> None:
+        """Write the state to HA only if it differs from the last one written.
+
+        Changes in availability are always written straight away. Other
+        changes are deferred while inside the minimum write interval or the
+        deadband and are then written on the trailing edge, so the latest
+        value always ends up in HA.
+        """
+        state = self._rendered_state()
+        last_state = self._last_written_state
+        if state == last_state:
+            self.suppressed_writes += 1
+            self._dispatcher.suppressed_writes += 1
+            return
+
+        if last_state is not None and state[0] == last_state[0]:
+
+            if not self._is_significant_change(last_state[2], state[2]):
+                self._async_schedule_trailing_write(
+                    max(self._min_write_interval, DEADBAND_MAX_AGE)
+                )
+                return
+
+            elapsed = monotonic() - self._last_write_time
+            if elapsed < self._min_write_interval:
+                self._async_schedule_trailing_write(self._min_write_interval - elapsed)
+                return
+
+        self._async_write_state(state)
+
+    @callback
+    def _async_write_state(self, state: tuple[bool, type, Any]) -> None:
+        """Write a state to HA and remember it."""
+        self._async_cancel_trailing_write()
+        self._last_written_state = state
+        self._last_write_time = monotonic()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_schedule_trailing_write(self, delay: float) -> None:
+        """Make sure the current state is written within a delay in seconds."""
+        due = monotonic() + delay
+        if self._cancel_trailing_write is not None:
+            if self._trailing_write_due <= due:
+                return
+            self._cancel_trailing_write()
+
+        self._trailing_write_due = due
+        self._cancel_trailing_write = async_call_later(
+            self.hass, delay, self._async_trailing_write
+        )
+
+    @callback
+    def _async_trailing_write(self, _now: datetime) -> None:
+        """Write the deferred state to HA if it is still different."""
+        self._cancel_trailing_write = None
+        state = self._rendered_state()
+        if state != self._last_written_state:
+            self._async_write_state(state)
+
+    @callback
+    def _async_cancel_trailing_write(self) -> None:
+        """Cancel any pending trailing write."""
+        if self._cancel_trailing_write is not None:
+            self._cancel_trailing_write()
+            self._cancel_trailing_write = None
+
+    def _state_change_callback(self) -> None:
+        """Run when device informs of state update. Updates local properties."""
+        self._update_updatable_attributes()
+        self._async_write_ha_state_if_changed()
@@ -0,0 +1,145 @@
+"""Smoothed estimate of the time remaining to full or empty."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+
+
+class SolixBLERemainingTimeEstimator:
+    """Estimates the time until the battery is full or empty.
+
+    The rate the battery percentage changes is the slope of a least squares
+    line through the readings within a rolling window. The sums the slope is
+    calculated from are updated as readings are added and drop out of the
+    window, so each reading costs O(1) however large the window is.
+
+    While discharging, the rate is scaled by the exponentially weighted
+    moving average of the power out, with a time constant of a quarter of
+    the window, over the mean power out within the window. A change of
+    load shows up sooner than the percentage alone would allow without
+    following every spike.
+    """
+
+    def __init__(self, window: float) -> None:
+        """Initialize the estimator.
+
+        :param window: Time in seconds readings are kept for.
+        """
+        self.window = window
+
+        # Readings of time, percentage and power out within the window
+        self._readings: deque[tuple[float, float, float | None]] = deque()
+        self._reset_sums(0)
+
+        # Readings dropped since the sums were last calculated from scratch
+        self._dropped = 0
+
+        self._power_average: float | None = None
+        self._power_time: float = 0
+
+    def add(self, percentage: float, power: float | None, now: float) -> None:
+        """Add a reading.
+
+        :param percentage: The battery percentage.
+        :param power: The power out or None if it is not known.
+        :param now: Monotonic time of the reading.
+        """
+        if power is not None:
+            if self._power_average is None:
+                self._power_average = power
+            else:
+                alpha = 1 - math.exp(-(now - self._power_time) * 4 / self.window)
+                self._power_average += alpha * (power - self._power_average)
+            self._power_time = now
+
+        if not self._readings:
+            self._reset_sums(now)
+        self._readings.append((now, percentage, power))
+        self._add_to_sums(now, percentage, power, 1)
+
+        while self._readings[0][0] < now - self.window:
+            self._add_to_sums(*self._readings.popleft(), -1)
+            self._dropped += 1
+
+        # Recalculated once the whole window has turned over so rounding
+        # errors do not build up and the times stay close to the origin
+        if self._dropped >= len(self._readings):
+            self._recalculate_sums()
+
+    def clear(self) -> None:
+        """Forget all readings, e.g after a gap in the telemetry."""
+        self._readings.clear()
+        self._reset_sums(0)
+        self._dropped = 0
+        self._power_average = None
+
+    @property
+    def hours_remaining(self) -> float | None:
+        """Return the hours until full or empty.
+
+        :returns: The hours, or None if the readings do not span at least a
+        quarter of the window or the percentage is not changing.
+        """
+        if (
+            len(self._readings) < 2
+            or self._readings[-1][0] - self._readings[0][0] < self.window / 4
+        ):
+            return None
+
+        count = self._count
+        variance = count * self._sum_tt - self._sum_t**2
+        if variance <= 0:
+            return None
+
+        # Percent per second and the fitted percentage of the latest reading
+        slope = (count * self._sum_tp - self._sum_t * self._sum_p) / variance
+        latest_time = self._readings[-1][0] - self._origin
+        latest = (self._sum_p + slope * (count * latest_time - self._sum_t)) / count
+        latest = min(max(latest, 0), 100)
+
+        if slope > 0:
+            return (100 - latest) / slope / 3600
+
+        if slope < 0:
+            rate = -slope
+            if self._power_average is not None and self._power_count:
+                mean_power = self._sum_power / self._power_count
+                if mean_power > 0:
+                    rate *= self._power_average / mean_power
+            if rate > 0:
+                return latest / rate / 3600
+
+        return None
+
+    def _add_to_sums(
+        self, time: float, percentage: float, power: float | None, sign: int
+    ) -> None:
+        """Add a reading to or remove it from the sums."""
+        time -= self._origin
+        self._count += sign
+        self._sum_t += sign * time
+        self._sum_p += sign * percentage
+        self._sum_tt += sign * time * time
+        self._sum_tp += sign * time * percentage
+        if power is not None:
+            self._power_count += sign
+            self._sum_power += sign * power
+
+    def _reset_sums(self, origin: float) -> None:
+        """Set the sums to zero with times relative to an origin."""
+        self._origin = origin
+        self._count = 0
+        self._sum_t: float = 0
+        self._sum_p: float = 0
+        self._sum_tt: float = 0
+        self._sum_tp: float = 0
+        self._power_count = 0
+        self._sum_power: float = 0
+
+    def _recalculate_sums(self) -> None:
+        """Calculate the sums from scratch relative to the oldest reading."""
+        self._reset_sums(self._readings[0][0])
+        for reading in self._readings:
+            self._add_to_sums(*reading, 1)
+        self._dropped = 0
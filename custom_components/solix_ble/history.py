@@ -0,0 +1,118 @@
+"""Recent telemetry history of SolixBLE devices kept in memory."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from time import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .dispatcher import SolixBLEDispatcher
+
+
+class SolixBLEHistory:
+    """Fixed size ring buffer of the recent readings of numeric attributes.
+
+    A row is added each time the device sends a packet changing any of the
+    attributes, with the readings of all of them. Each attribute is kept in
+    its own array of 32 bit floats, with missing readings stored as NaN,
+    so the memory used is fixed and nothing is written to the recorder.
+    Once full the oldest rows are overwritten.
+    """
+
+    def __init__(
+        self, dispatcher: SolixBLEDispatcher, attributes: Iterable[str], size: int
+    ) -> None:
+        """Initialize the history. Does not subscribe to the device.
+
+        :param dispatcher: The dispatcher of the device.
+        :param attributes: Names of the attributes to keep.
+        :param size: Number of rows to keep.
+        """
+        self.dispatcher = dispatcher
+        self.attributes = tuple(attributes)
+        self.size = size
+        self._times = array("d", bytes(8 * size))
+        self._values = {
+            attribute: array("f", bytes(4 * size)) for attribute in self.attributes
+        }
+
+        # Index of the next row to write and number of rows written
+        self._next = 0
+        self._count = 0
+        self._unsubscribes: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Start keeping the readings of the attributes."""
+        for attribute in self.attributes:
+            self._unsubscribes.append(
+                self.dispatcher.async_subscribe(attribute, self._async_add_row)
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop keeping the readings of the attributes."""
+        while self._unsubscribes:
+            self._unsubscribes.pop()()
+
+    @callback
+    def _async_add_row(self) -> None:
+        """Add the current readings of all attributes.
+
+        Subscribed to every attribute, but the dispatcher only runs it once
+        per packet however many of them changed.
+        """
+        index = self._next
+        self._times[index] = time()
+        available = self.dispatcher.available
+        for attribute, values in self._values.items():
+            value = self.dispatcher.get(attribute) if available else None
+            values[index] = value if type(value) in (int, float) else math.nan
+
+        self._next = (index + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+    def query(
+        self,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        attributes: Iterable[str] | None = None,
+    ) -> dict[str, Any]:
+        """Return the rows within a time range as columns.
+
+        :param start_time: Earliest time of the rows in seconds since the epoch.
+        :param end_time: Latest time of the rows in seconds since the epoch.
+        :param attributes: Names of the attributes to return, all by default.
+        :returns: The times of the rows and the readings of each attribute,
+        with missing readings as None. Readings are rounded to 3 decimal
+        places as they are stored as 32 bit floats.
+        """
+        # Row i counting from the oldest is stored at (first + i) % size
+        first = (self._next - self._count) % self.size
+        rows = range(self._count)
+
+        def _time(row: int) -> float:
+            return self._times[(first + row) % self.size]
+
+        start = 0 if start_time is None else bisect_left(rows, start_time, key=_time)
+        end = (
+            self._count if end_time is None else bisect_right(rows, end_time, key=_time)
+        )
+        indexes = [(first + row) % self.size for row in range(start, end)]
+
+        return {
+            "time": [self._times[index] for index in indexes],
+            "values": {
+                attribute: [
+                    None if math.isnan(value) else round(value, 3)
+                    for value in map(self._values[attribute].__getitem__, indexes)
+                ]
+                for attribute in (self.attributes if attributes is None else attributes)
+                if attribute in self._values
+            },
+        }
@@ -0,0 +1,207 @@
+"""Sharing of Bluetooth connection slots between SolixBLE devices."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+
+from bleak.backends.device import BLEDevice
+from homeassistant.components.bluetooth import (
+    BaseHaScanner,
+    async_scanner_devices_by_address,
+)
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.hass_dict import HassKey
+
+from .const import CONNECTION_SLOT_RECHECK_INTERVAL, DEFAULT_CONNECTION_SLOTS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SolixBLEConnectionScheduler:
+    """Decides when and through which adapter each device connects.
+
+    Connection attempts are made one at a time across all config entries,
+    in the order the devices asked to connect. A device is connected
+    through the adapter which hears it with the best RSSI and has a free
+    connection slot. Devices whose adapters are all full wait without
+    holding up devices behind them which can be connected elsewhere.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler.
+
+        :param hass: Home Assistant instance.
+        """
+        self.hass = hass
+
+        # Devices waiting for their turn in the order they asked
+        self._queue: dict[str, asyncio.Future[BLEDevice | None]] = {}
+        self._connecting: str | None = None
+
+        # Adapter whose slot is used by each connected device
+        self._sources: dict[str, str | None] = {}
+        self._cancel_recheck: CALLBACK_TYPE | None = None
+
+    async def async_acquire(self, address: str) -> BLEDevice | None:
+        """Wait for the turn of a device to connect.
+
+        Once this returns the device must report the result of its attempt
+        with async_attempt_finished to let the next device connect.
+
+        :param address: Bluetooth address of the device.
+        :returns: Device to connect through or None if no adapter has heard
+        the device, in which case the last known path is tried.
+        """
+        future: asyncio.Future[BLEDevice | None] = self.hass.loop.create_future()
+        self._queue[address] = future
+        self._async_dispatch()
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if self._queue.get(address) is future:
+                del self._queue[address]
+            elif self._connecting == address:
+                self.async_attempt_finished(address, False)
+            raise
+
+    @callback
+    def async_attempt_finished(self, address: str, connected: bool) -> None:
+        """Let the next device connect.
+
+        :param address: Bluetooth address of the device.
+        :param connected: If the device is now connected and using the slot.
+        """
+        if self._connecting == address:
+            self._connecting = None
+        if not connected:
+            self._sources.pop(address, None)
+        self._async_dispatch()
+
+    @callback
+    def async_mark_connected(self, address: str, source: str | None) -> None:
+        """Count a device connected without taking a turn, e.g by the config flow.
+
+        :param address: Bluetooth address of the device.
+        :param source: Adapter the device is connected through, if known.
+        """
+        self._sources[address] = source
+
+    @callback
+    def async_release(self, address: str) -> None:
+        """Free the slot used by a device which is no longer connected.
+
+        :param address: Bluetooth address of the device.
+        """
+        if self._sources.pop(address, None) is not None:
+            self._async_dispatch()
+
+    @callback
+    def _async_recheck(self, _now: datetime) -> None:
+        """Check for free slots again."""
+        self._cancel_recheck = None
+        self._async_dispatch()
+
+    @callback
+    def _async_dispatch(self) -> None:
+        """Give the turn to the first waiting device which can connect."""
+        if self._connecting is not None:
+            return
+
+        for address, future in self._queue.items():
+            if (path := self._async_find_path(address)) is None:
+                continue
+
+            ble_device, source = path
+            del self._queue[address]
+            self._connecting = address
+            self._sources[address] = source
+            _LOGGER.debug("Connecting to '%s' through '%s'", address, source)
+            future.set_result(ble_device)
+            break
+
+        if not self._queue:
+            self._async_cancel_recheck()
+            return
+
+        # Free slots are checked again as they can be freed by other integrations
+        if self._connecting is None and self._cancel_recheck is None:
+            _LOGGER.debug(
+                "All adapters near %s are full, waiting", ", ".join(self._queue)
+            )
+            self._cancel_recheck = async_call_later(
+                self.hass, CONNECTION_SLOT_RECHECK_INTERVAL, self._async_recheck
+            )
+
+    @callback
+    def _async_find_path(
+        self, address: str
+    ) -> tuple[BLEDevice | None, str | None] | None:
+        """Return the best device and adapter to connect to a device through.
+
+        :param address: Bluetooth address of the device.
+        :returns: The device and adapter source, (None, None) if no adapter
+        has heard the device or None if all adapters which have are full.
+        """
+        scanner_devices = async_scanner_devices_by_address(
+            self.hass, address, connectable=True
+        )
+        if not scanner_devices:
+            return None, None
+
+        for scanner_device in sorted(
+            scanner_devices,
+            key=lambda scanner_device: scanner_device.advertisement.rssi,
+            reverse=True,
+        ):
+            if self._has_free_slot(scanner_device.scanner):
+                return scanner_device.ble_device, scanner_device.scanner.source
+
+        return None
+
+    def _has_free_slot(self, scanner: BaseHaScanner) -> bool:
+        """Return if an adapter can take another connection.
+
+        Adapters which report their slots are trusted as they include the
+        connections of other integrations, otherwise only the connections of
+        this integration are counted.
+        """
+        get_allocations = getattr(scanner, "get_allocations", None)
+        if get_allocations is not None and (allocations := get_allocations()):
+            return allocations.free > 0
+
+        used = sum(1 for source in self._sources.values() if source == scanner.source)
+        return used < DEFAULT_CONNECTION_SLOTS
+
+    @callback
+    def async_shutdown(self, event: Event | None = None) -> None:
+        """Stop checking for free slots."""
+        self._async_cancel_recheck()
+
+    @callback
+    def _async_cancel_recheck(self) -> None:
+        """Cancel checking for free slots again."""
+        if self._cancel_recheck is not None:
+            self._cancel_recheck()
+            self._cancel_recheck = None
+
+
+DATA_SCHEDULER: HassKey[SolixBLEConnectionScheduler] = HassKey(f"{DOMAIN}_scheduler")
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> SolixBLEConnectionScheduler:
+    """Return the scheduler shared by all config entries, creating it on first use.
+
+    :param hass: Home Assistant instance.
+    """
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is not None:
+        return scheduler
+
+    scheduler = hass.data[DATA_SCHEDULER] = SolixBLEConnectionScheduler(hass)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, scheduler.async_shutdown)
+    return scheduler
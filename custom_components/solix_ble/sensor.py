@@ -3,24 +3,70 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
-
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.components.sensor.const import SensorDeviceClass
-from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH, DeviceInfo
+from homeassistant.const import (
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util.dt import as_local
-from SolixBLE import C300, C300DC, C800, C1000, C1000G2, F2000, F3800, SolixBLEDevice
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util.dt import as_local, parse_datetime, utcnow
+from SolixBLE import (
+    C300,
+    C300DC,
+    C800,
+    C1000,
+    C1000G2,
+    F2000,
+    F3800,
+    SolixBLEDevice,
+)
 
 from .const import (
+    ATTR_STALE,
     CHARGING_STATUS_C300_STRINGS,
     CHARGING_STATUS_F3800_STRINGS,
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_PERCENT,
+    CONF_ESTIMATE_WINDOW,
+    CONF_POWER_STATISTICS,
+    CONF_POWER_WRITE_INTERVAL,
+    CONF_SENSOR_WRITE_INTERVAL,
+    DEFAULT_DEADBAND_ABSOLUTE,
+    DEFAULT_DEADBAND_PERCENT,
+    DEFAULT_ESTIMATE_WINDOW,
+    DEFAULT_POWER_STATISTICS,
+    DEFAULT_WRITE_INTERVAL,
+    ENERGY_UPDATE_INTERVAL,
+    ESTIMATE_SAMPLE_INTERVAL,
     LIGHT_STATUS_STRINGS,
     OVERLOAD_STATUS_C300DC_STRINGS,
     PORT_STATUS_STRINGS,
+    RSSI_WRITE_INTERVAL,
 )
+from .dispatcher import SolixBLEDispatcher
+from .entity import SolixBLEEntity
+from .estimator import SolixBLERemainingTimeEstimator
+from .statistics import SolixBLEStatistics
+from .store import NO_STATE
+from .supervisor import SolixBLESupervisor
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +75,755 @@ if TYPE_CHECKING:
     from . import SolixBLEConfigEntry
 
 
+@dataclass(frozen=True, kw_only=True)
+class SolixSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor and which models support it.
+
+    The key is the name of the attribute in the API object. Static sensors
+    are only read once after connecting rather than on every update.
+    """
+
+    models: tuple[type[SolixBLEDevice], ...]
+    static: bool = False
+
+
+SENSOR_DESCRIPTIONS: tuple[SolixSensorEntityDescription, ...] = (
+    # Charging status sensor
+    SolixSensorEntityDescription(
+        key="charging_status",
+        name="Charging Status",
+        device_class=SensorDeviceClass.ENUM,
+        options=CHARGING_STATUS_C300_STRINGS,
+        models=(C300, C300DC),
+    ),
+    # Charging status sensor
+    SolixSensorEntityDescription(
+        key="charging_status",
+        name="Charging Status",
+        device_class=SensorDeviceClass.ENUM,
+        options=CHARGING_STATUS_F3800_STRINGS,
+        models=(F3800,),
+    ),
+    # Time remaining sensors
+    SolixSensorEntityDescription(
+        key="hours_remaining",
+        name="Remaining Hours",
+        native_unit_of_measurement="hours",
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000, F2000, F3800),
+    ),
+    SolixSensorEntityDescription(
+        key="days_remaining",
+        name="Remaining Days",
+        native_unit_of_measurement="days",
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000, F2000, F3800),
+    ),
+    SolixSensorEntityDescription(
+        key="time_remaining",
+        name="Remaining Time",
+        native_unit_of_measurement="hours",
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000, F2000, F3800),
+    ),
+    SolixSensorEntityDescription(
+        key="timestamp_remaining",
+        name="Timestamp Remaining",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        models=(C300, C300DC, C800, C1000, F2000, F3800),
+    ),
+    # Battery percentage sensor
+    SolixSensorEntityDescription(
+        key="battery_percentage",
+        name="Battery Percentage",
+        native_unit_of_measurement="%",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    # Battery health sensor
+    SolixSensorEntityDescription(
+        key="battery_health",
+        name="Battery Health",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300DC, C800, C1000, C1000G2, F2000),
+    ),
+    # Temperature sensor
+    SolixSensorEntityDescription(
+        key="temperature",
+        name="Temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    # Total power in sensor
+    SolixSensorEntityDescription(
+        key="power_in",
+        name="Total Power In",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000),
+    ),
+    # Total power out sensor
+    SolixSensorEntityDescription(
+        key="power_out",
+        name="Total Power Out",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000, C1000G2, F3800),
+    ),
+    # AC power in sensor
+    SolixSensorEntityDescription(
+        key="ac_power_in",
+        name="AC Power In",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    # AC power out sensor
+    SolixSensorEntityDescription(
+        key="ac_power_out",
+        name="AC Power Out",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    # AC output on/off sensor
+    SolixSensorEntityDescription(
+        key="ac_output",
+        name="Status AC Out",
+        device_class=SensorDeviceClass.ENUM,
+        options=PORT_STATUS_STRINGS,
+        models=(C300, C800, C1000, C1000G2, F3800),
+    ),
+    # AC output timer
+    SolixSensorEntityDescription(
+        key="ac_timer",
+        name="AC Timer",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        models=(C300, C800, C1000),
+    ),
+    # Solar power in
+    SolixSensorEntityDescription(
+        key="solar_power_in",
+        name="Solar Power In",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    # Battery power in and out
+    SolixSensorEntityDescription(
+        key="battery_charge_power",
+        name="Battery Charge Power",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(F3800,),
+    ),
+    SolixSensorEntityDescription(
+        key="battery_discharge_power",
+        name="Battery Discharge Power",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(F3800,),
+    ),
+    # DC power out
+    SolixSensorEntityDescription(
+        key="dc_power_out",
+        name="DC Power Out",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C1000G2),
+    ),
+    # DC/Solar power in status
+    SolixSensorEntityDescription(
+        key="solar_port",
+        name="Status Solar",
+        device_class=SensorDeviceClass.ENUM,
+        options=PORT_STATUS_STRINGS,
+        models=(C300DC,),
+    ),
+    # DC power out status
+    # TODO: Reenable for C1000 when underlying library fixes
+    SolixSensorEntityDescription(
+        key="dc_output",
+        name="Status DC Out",
+        device_class=SensorDeviceClass.ENUM,
+        options=PORT_STATUS_STRINGS,
+        models=(C300, C1000G2, F3800),
+    ),
+    # DC Timer
+    SolixSensorEntityDescription(
+        key="dc_timer",
+        name="DC Timer",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        models=(C300, C300DC),
+    ),
+    # USB C1 power out
+    SolixSensorEntityDescription(
+        key="usb_c1_power",
+        name="USB C1 Power",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    # USB C2 power out
+    SolixSensorEntityDescription(
+        key="usb_c2_power",
+        name="USB C2 Power",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    # USB C3 power out
+    SolixSensorEntityDescription(
+        key="usb_c3_power",
+        name="USB C3 Power",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C1000G2, F2000, F3800),
+    ),
+    # USB C4 power out
+    SolixSensorEntityDescription(
+        key="usb_c4_power",
+        name="USB C4 Power",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300DC,),
+    ),
+    # USB A1 power out
+    SolixSensorEntityDescription(
+        key="usb_a1_power",
+        name="USB A1 Power",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300, C300DC, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    # USB A2 power out
+    SolixSensorEntityDescription(
+        key="usb_a2_power",
+        name="USB A2 Power",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C300DC, C800, C1000, F2000, F3800),
+    ),
+    # USB C1 status
+    SolixSensorEntityDescription(
+        key="usb_port_c1",
+        name="Status USB C1",
+        device_class=SensorDeviceClass.ENUM,
+        options=PORT_STATUS_STRINGS,
+        models=(C300, C300DC, C1000G2, F3800),
+    ),
+    # USB C2 status
+    SolixSensorEntityDescription(
+        key="usb_port_c2",
+        name="Status USB C2",
+        device_class=SensorDeviceClass.ENUM,
+        options=PORT_STATUS_STRINGS,
+        models=(C300, C300DC, C1000G2, F3800),
+    ),
+    # USB C3 status
+    SolixSensorEntityDescription(
+        key="usb_port_c3",
+        name="Status USB C3",
+        device_class=SensorDeviceClass.ENUM,
+        options=PORT_STATUS_STRINGS,
+        models=(C300, C300DC, C1000G2, F3800),
+    ),
+    # USB C4 status
+    SolixSensorEntityDescription(
+        key="usb_port_c4",
+        name="Status USB C4",
+        device_class=SensorDeviceClass.ENUM,
+        options=PORT_STATUS_STRINGS,
+        models=(C300DC,),
+    ),
+    # USB A1 status
+    SolixSensorEntityDescription(
+        key="usb_port_a1",
+        name="Status USB A1",
+        device_class=SensorDeviceClass.ENUM,
+        options=PORT_STATUS_STRINGS,
+        models=(C300, C300DC, C1000G2, F3800),
+    ),
+    # USB A2 status
+    SolixSensorEntityDescription(
+        key="usb_port_a2",
+        name="Status USB A2",
+        device_class=SensorDeviceClass.ENUM,
+        options=PORT_STATUS_STRINGS,
+        models=(C300DC, F3800),
+    ),
+    # Overload status
+    SolixSensorEntityDescription(
+        key="device_overload",
+        name="Overload Status",
+        device_class=SensorDeviceClass.ENUM,
+        options=OVERLOAD_STATUS_C300DC_STRINGS,
+        models=(C300DC,),
+    ),
+    # Light status
+    SolixSensorEntityDescription(
+        key="light",
+        name="Status Light",
+        device_class=SensorDeviceClass.ENUM,
+        options=LIGHT_STATUS_STRINGS,
+        models=(C300, C300DC),
+    ),
+    # Display status
+    SolixSensorEntityDescription(
+        key="display_mode",
+        name="Display Status",
+        device_class=SensorDeviceClass.ENUM,
+        options=LIGHT_STATUS_STRINGS,
+        models=(C300DC,),
+    ),
+    # Firmware version
+    SolixSensorEntityDescription(
+        key="software_version",
+        name="Firmware Version",
+        static=True,
+        models=(C300, C300DC, C800, C1000, F2000, F3800),
+    ),
+    # Serial number
+    SolixSensorEntityDescription(
+        key="serial_number",
+        name="Serial Number",
+        static=True,
+        models=(C300, C300DC, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    # Expansion battery temperature sensor
+    SolixSensorEntityDescription(
+        key="temperature_expansion",
+        name="Expansion Battery Temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C1000, F2000),
+    ),
+    # Expansion battery percentage
+    SolixSensorEntityDescription(
+        key="battery_percentage_expansion",
+        name="Expansion Battery Percentage",
+        native_unit_of_measurement="%",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C1000, F2000),
+    ),
+    # Average battery percentage across all batteries
+    SolixSensorEntityDescription(
+        key="battery_percentage_aggregate",
+        name="Average Battery Percentage",
+        native_unit_of_measurement="%",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(F3800,),
+    ),
+    # Expansion battery health
+    SolixSensorEntityDescription(
+        key="battery_health_expansion",
+        name="Expansion Battery Health",
+        native_unit_of_measurement="%",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        models=(C1000, F2000),
+    ),
+    # Expansion battery firmware version
+    SolixSensorEntityDescription(
+        key="software_version_expansion",
+        name="Expansion Battery Firmware Version",
+        static=True,
+        models=(C1000, F2000),
+    ),
+    # Number of expansion batteries
+    SolixSensorEntityDescription(
+        key="num_expansion",
+        name="Number Of Expansion Batteries",
+        state_class=SensorStateClass.MEASUREMENT,
+        static=True,
+        models=(C1000, F2000),
+    ),
+)
+
+# Descriptions of the sensors supported by each model, built once at import
+SENSORS_BY_MODEL: dict[
+    type[SolixBLEDevice], tuple[SolixSensorEntityDescription, ...]
+] = {
+    model: tuple(
+        description
+        for description in SENSOR_DESCRIPTIONS
+        if model in description.models
+    )
+    for model in (C300, C300DC, C800, C1000, C1000G2, F2000, F3800)
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolixEnergySensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the energy through a power sensor.
+
+    The power key is the name of the power attribute in the API object.
+    """
+
+    models: tuple[type[SolixBLEDevice], ...]
+    power_key: str
+
+
+# An energy sensor for every power sensor, the USB ports are disabled by
+# default as they are of little use on the energy dashboard
+ENERGY_SENSOR_DESCRIPTIONS: tuple[SolixEnergySensorEntityDescription, ...] = tuple(
+    SolixEnergySensorEntityDescription(
+        key=f"{description.key}_energy",
+        name=description.name.replace("Power", "Energy"),
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+        entity_registry_enabled_default=not description.key.startswith("usb_"),
+        models=description.models,
+        power_key=description.key,
+    )
+    for description in SENSOR_DESCRIPTIONS
+    if description.device_class is SensorDeviceClass.POWER
+)
+
+ENERGY_SENSORS_BY_MODEL: dict[
+    type[SolixBLEDevice], tuple[SolixEnergySensorEntityDescription, ...]
+] = {
+    model: tuple(
+        description
+        for description in ENERGY_SENSOR_DESCRIPTIONS
+        if model in description.models
+    )
+    for model in (C300, C300DC, C800, C1000, C1000G2, F2000, F3800)
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolixDerivedSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor calculated from other attributes of a device.
+
+    Only the inputs which the model has sensors for are used. The value
+    function is given the readings of the inputs by attribute name.
+    """
+
+    models: tuple[type[SolixBLEDevice], ...]
+    inputs: tuple[str, ...]
+    value_fn: Callable[[dict[str, float]], float | None]
+
+
+DERIVED_SENSOR_DESCRIPTIONS: tuple[SolixDerivedSensorEntityDescription, ...] = (
+    # Power going into the battery, negative while discharging
+    SolixDerivedSensorEntityDescription(
+        key="net_power",
+        name="Net Power",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        inputs=("power_in", "power_out"),
+        value_fn=lambda values: values["power_in"] - values["power_out"],
+        models=(C300, C300DC, C800, C1000),
+    ),
+    # Power out of all USB ports
+    SolixDerivedSensorEntityDescription(
+        key="usb_power",
+        name="Total USB Power",
+        native_unit_of_measurement="W",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        inputs=(
+            "usb_c1_power",
+            "usb_c2_power",
+            "usb_c3_power",
+            "usb_c4_power",
+            "usb_a1_power",
+            "usb_a2_power",
+        ),
+        value_fn=lambda values: sum(values.values()),
+        models=(C300, C300DC, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    # Share of the power out which is AC, unknown while there is none
+    SolixDerivedSensorEntityDescription(
+        key="ac_output_share",
+        name="AC Output Share",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        inputs=("ac_power_out", "power_out"),
+        value_fn=lambda values: (
+            values["ac_power_out"] / values["power_out"] * 100
+            if values["power_out"]
+            else None
+        ),
+        models=(C300, C800, C1000, C1000G2, F3800),
+    ),
+    # Power out over the battery power out, unknown unless only the battery
+    # is powering the outputs
+    SolixDerivedSensorEntityDescription(
+        key="discharge_efficiency",
+        name="Discharge Efficiency",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        inputs=(
+            "power_out",
+            "battery_discharge_power",
+            "ac_power_in",
+            "solar_power_in",
+        ),
+        value_fn=lambda values: (
+            values["power_out"] / values["battery_discharge_power"] * 100
+            if values["battery_discharge_power"]
+            and not values["ac_power_in"]
+            and not values["solar_power_in"]
+            else None
+        ),
+        models=(F3800,),
+    ),
+    # Battery power in over the power in, unknown unless all of the power
+    # in is charging the battery
+    SolixDerivedSensorEntityDescription(
+        key="charge_efficiency",
+        name="Charge Efficiency",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        inputs=(
+            "battery_charge_power",
+            "ac_power_in",
+            "solar_power_in",
+            "power_out",
+        ),
+        value_fn=lambda values: (
+            values["battery_charge_power"]
+            / (values["ac_power_in"] + values["solar_power_in"])
+            * 100
+            if (values["ac_power_in"] or values["solar_power_in"])
+            and not values["power_out"]
+            else None
+        ),
+        models=(F3800,),
+    ),
+)
+
+DERIVED_SENSORS_BY_MODEL: dict[
+    type[SolixBLEDevice], tuple[SolixDerivedSensorEntityDescription, ...]
+] = {
+    model: tuple(
+        description
+        for description in DERIVED_SENSOR_DESCRIPTIONS
+        if model in description.models
+    )
+    for model in (C300, C300DC, C800, C1000, C1000G2, F2000, F3800)
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolixEstimateSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the estimated time until full or empty.
+
+    The value function converts the estimated hours to the native value.
+    """
+
+    models: tuple[type[SolixBLEDevice], ...]
+    value_fn: Callable[[float], Any]
+
+
+def _estimated_timestamp(hours: float) -> datetime:
+    """Return the time when full or empty, rounded to the minute."""
+    return (utcnow() + timedelta(hours=hours)).replace(second=0, microsecond=0)
+
+
+ESTIMATE_SENSOR_DESCRIPTIONS: tuple[SolixEstimateSensorEntityDescription, ...] = (
+    # Smoothed alternatives to the remaining time reported by the device
+    SolixEstimateSensorEntityDescription(
+        key="estimated_time_remaining",
+        name="Estimated Remaining Time",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda hours: round(hours, 1),
+        models=(C300, C300DC, C800, C1000, C1000G2, F2000, F3800),
+    ),
+    SolixEstimateSensorEntityDescription(
+        key="estimated_timestamp_remaining",
+        name="Estimated Timestamp Remaining",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=_estimated_timestamp,
+        models=(C300, C300DC, C800, C1000, C1000G2, F2000, F3800),
+    ),
+)
+
+ESTIMATE_SENSORS_BY_MODEL: dict[
+    type[SolixBLEDevice], tuple[SolixEstimateSensorEntityDescription, ...]
+] = {
+    model: tuple(
+        description
+        for description in ESTIMATE_SENSOR_DESCRIPTIONS
+        if model in description.models
+    )
+    for model in (C300, C300DC, C800, C1000, C1000G2, F2000, F3800)
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolixConnectionSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the health of the connection to a device."""
+
+    value_fn: Callable[[SolixBLESupervisor], float | None]
+    min_write_interval: float = 0
+
+
+CONNECTION_SENSOR_DESCRIPTIONS: tuple[SolixConnectionSensorEntityDescription, ...] = (
+    # Time taken by the last successful connection and negotiation
+    SolixConnectionSensorEntityDescription(
+        key="connect_time",
+        name="Connect Time",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda supervisor: supervisor.last_connect_time,
+    ),
+    # Signal strength of the advertisements, known without connecting
+    SolixConnectionSensorEntityDescription(
+        key="rssi",
+        name="Signal Strength",
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        min_write_interval=RSSI_WRITE_INTERVAL,
+        value_fn=lambda supervisor: supervisor.rssi,
+    ),
+    # Number of times the connection was lost
+    SolixConnectionSensorEntityDescription(
+        key="disconnects",
+        name="Disconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda supervisor: supervisor.disconnects,
+    ),
+    # Time taken by the last reconnection
+    SolixConnectionSensorEntityDescription(
+        key="reconnect_time",
+        name="Reconnect Time",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda supervisor: supervisor.last_reconnect_time,
+    ),
+    # Total time spent reconnecting
+    SolixConnectionSensorEntityDescription(
+        key="unavailable_time",
+        name="Time Unavailable",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda supervisor: supervisor.unavailable_time,
+    ),
+    # Time from queueing the last command until it was sent
+    SolixConnectionSensorEntityDescription(
+        key="command_latency",
+        name="Command Latency",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda supervisor: supervisor.commands.last_latency,
+    ),
+    # Time from queueing the last command until the device reported its effect
+    SolixConnectionSensorEntityDescription(
+        key="confirmation_latency",
+        name="Confirmation Latency",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda supervisor: supervisor.commands.last_confirmation_latency,
+    ),
+)
+
+
+# Sentinel for a value which has not been read yet
+_UNSET = object()
+
+
+def _convert_value(value: Any) -> Any:
+    """Pass through value."""
+    return value
+
+
+def _convert_timestamp(value: datetime | None) -> datetime | None:
+    """Add timezone info to timestamp."""
+    return None if value is None else as_local(value)
+
+
+def _get_converter(
+    description: SolixSensorEntityDescription,
+) -> Callable[[Any], Any]:
+    """Return the function converting API values to native values of a sensor."""
+
+    if description.device_class is SensorDeviceClass.TIMESTAMP:
+        return _convert_timestamp
+
+    if description.device_class is SensorDeviceClass.ENUM:
+        options = description.options
+
+        def _convert_enum(value: Enum | None) -> str | None:
+            """Use enum strings."""
+            return None if value is None else options[value.value + 1]
+
+        return _convert_enum
+
+    return _convert_value
+
+
+def _outside_deadband(
+    old_value: Any, new_value: Any, absolute: float, percent: float
+) -> bool:
+    """Return if a change in value is outside of a deadband.
+
+    :param old_value: Value last written.
+    :param new_value: New value.
+    :param absolute: Changes of this size or smaller are inside.
+    :param percent: Changes of this percentage of the old value or smaller are inside.
+    """
+    if not (absolute or percent):
+        return True
+
+    if type(old_value) not in (int, float) or type(new_value) not in (int, float):
+        return True
+
+    delta = abs(new_value - old_value)
+    return delta > absolute and delta > abs(old_value) * percent / 100
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: SolixBLEConfigEntry,
@@ -36,590 +831,499 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Sensors."""
 
-    device = config_entry.runtime_data
-    sensors: list[SolixSensorEntity] = []
-
-    # Charging status sensor
-    if type(device) in [C300, C300DC]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Charging Status",
-                None,
-                "charging_status",
-                SensorDeviceClass.ENUM,
-                CHARGING_STATUS_C300_STRINGS,
-                None,
-            )
+    dispatcher = config_entry.runtime_data.dispatcher
+    supervisor = config_entry.runtime_data.supervisor
+    options = config_entry.options
+    power_write_interval = options.get(
+        CONF_POWER_WRITE_INTERVAL, DEFAULT_WRITE_INTERVAL
+    )
+    sensor_write_interval = options.get(
+        CONF_SENSOR_WRITE_INTERVAL, DEFAULT_WRITE_INTERVAL
+    )
+    deadband_absolute = options.get(CONF_DEADBAND_ABSOLUTE, DEFAULT_DEADBAND_ABSOLUTE)
+    deadband_percent = options.get(CONF_DEADBAND_PERCENT, DEFAULT_DEADBAND_PERCENT)
+    power_statistics = options.get(CONF_POWER_STATISTICS, DEFAULT_POWER_STATISTICS)
+    if power_statistics and "recorder" not in hass.config.components:
+        _LOGGER.warning(
+            "The recorder is not loaded, power of '%s' is shown as sensors instead "
+            "of statistics",
+            dispatcher.device.name,
         )
+        power_statistics = False
+
+    sensors: list[SolixBLEEntity] = [
+        SolixConnectionSensorEntity(dispatcher, supervisor, description)
+        for description in CONNECTION_SENSOR_DESCRIPTIONS
+    ]
+    statistics_names: dict[str, str] = {}
+    for description in SENSORS_BY_MODEL.get(type(dispatcher.device), ()):
+        if power_statistics and description.device_class is SensorDeviceClass.POWER:
+            statistics_names[description.key] = (
+                f"{dispatcher.device.name} {description.name}"
+            )
+            continue
 
-    # Charging status sensor
-    if type(device) in [F3800]:
+        numeric = description.state_class is SensorStateClass.MEASUREMENT
         sensors.append(
             SolixSensorEntity(
-                device,
-                "Charging Status",
-                None,
-                "charging_status",
-                SensorDeviceClass.ENUM,
-                CHARGING_STATUS_F3800_STRINGS,
-                None,
+                dispatcher,
+                description,
+                min_write_interval=(
+                    power_write_interval
+                    if description.device_class is SensorDeviceClass.POWER
+                    else sensor_write_interval
+                ),
+                deadband_absolute=deadband_absolute if numeric else 0,
+                deadband_percent=deadband_percent if numeric else 0,
             )
         )
+    model_keys = {
+        description.key
+        for description in SENSORS_BY_MODEL.get(type(dispatcher.device), ())
+    }
+    for description in DERIVED_SENSORS_BY_MODEL.get(type(dispatcher.device), ()):
+        power = description.device_class is SensorDeviceClass.POWER
+        if power and power_statistics:
+            continue
 
-    # Time remaining sensor
-    if type(device) in [C300, C300DC, C800, C1000, F2000, F3800]:
         sensors.append(
-            SolixSensorEntity(device, "Remaining Hours", "hours", "hours_remaining"),
+            SolixDerivedSensorEntity(
+                dispatcher,
+                description,
+                tuple(key for key in description.inputs if key in model_keys),
+                min_write_interval=(
+                    power_write_interval if power else sensor_write_interval
+                ),
+                deadband_absolute=deadband_absolute,
+                deadband_percent=deadband_percent,
+            )
         )
-        sensors.append(
-            SolixSensorEntity(device, "Remaining Days", "days", "days_remaining"),
+    estimate_window = options.get(CONF_ESTIMATE_WINDOW, DEFAULT_ESTIMATE_WINDOW)
+    sensors.extend(
+        SolixEstimateSensorEntity(
+            dispatcher,
+            description,
+            "power_out" if "power_out" in model_keys else None,
+            estimate_window,
+            min_write_interval=sensor_write_interval,
+            deadband_absolute=deadband_absolute,
+            deadband_percent=deadband_percent,
         )
-        sensors.append(
-            SolixSensorEntity(device, "Remaining Time", "hours", "time_remaining"),
+        for description in ESTIMATE_SENSORS_BY_MODEL.get(type(dispatcher.device), ())
+    )
+    sensors.extend(
+        SolixEnergySensorEntity(
+            dispatcher, supervisor, description, sensor_write_interval
         )
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Timestamp Remaining",
-                None,
-                "timestamp_remaining",
-                SensorDeviceClass.TIMESTAMP,
-                state_class=None,
-            )
-        ),
+        for description in ENERGY_SENSORS_BY_MODEL.get(type(dispatcher.device), ())
+    )
 
-    # Battery percentage sensor
-    if type(device) in [C300, C300DC, C800, C1000, C1000G2, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Battery Percentage",
-                "%",
-                "battery_percentage",
-                SensorDeviceClass.BATTERY,
-            )
-        )
+    # Power is added to the long-term statistics instead of written as states
+    if statistics_names:
+        statistics = SolixBLEStatistics(hass, dispatcher, statistics_names)
+        statistics.async_start()
+        config_entry.async_on_unload(statistics.async_stop)
 
-    # Battery health sensor
-    if type(device) in [C300DC, C800, C1000, C1000G2, F2000]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Battery Health",
-                "%",
-                "battery_health",
-                None,
-            )
-        )
+    async_add_entities(sensors)
 
-    # Temperature sensor
-    if type(device) in [C300, C300DC, C800, C1000, C1000G2, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Temperature",
-                UnitOfTemperature.CELSIUS,
-                "temperature",
-                SensorDeviceClass.TEMPERATURE,
-            )
-        )
 
-    # Total power in sensor
-    if type(device) in [C300, C300DC, C800, C1000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device, "Total Power In", "W", "power_in", SensorDeviceClass.POWER
-            )
-        )
+class SolixSensorEntity(SolixBLEEntity, SensorEntity):
+    """Representation of a device."""
 
-    # Total power out sensor
-    if type(device) in [C300, C300DC, C800, C1000, C1000G2, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device, "Total Power Out", "W", "power_out", SensorDeviceClass.POWER
-            )
-        )
+    entity_description: SolixSensorEntityDescription
 
-    # AC power in sensor
-    if type(device) in [C300, C800, C1000, C1000G2, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "AC Power In",
-                "W",
-                "ac_power_in",
-                SensorDeviceClass.POWER,
-            )
-        ),
+    def __init__(
+        self,
+        dispatcher: SolixBLEDispatcher,
+        description: SolixSensorEntityDescription,
+        min_write_interval: float = 0,
+        deadband_absolute: float = 0,
+        deadband_percent: float = 0,
+    ) -> None:
+        """Initialize the device object. Does not connect.
 
-    # AC power out sensor
-    if type(device) in [C300, C800, C1000, C1000G2, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "AC Power Out",
-                "W",
-                "ac_power_out",
-                SensorDeviceClass.POWER,
-            )
-        ),
+        :param dispatcher: The dispatcher of the device.
+        :param description: Description of the sensor entity.
+        :param min_write_interval: Minimum time in seconds between state writes.
+        :param deadband_absolute: Changes of this size or smaller are deferred.
+        :param deadband_percent: Changes of this percentage or smaller are deferred.
+        """
 
-    # AC output on/off sensor
-    if type(device) in [C300, C800, C1000, C1000G2, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Status AC Out",
-                None,
-                "ac_output",
-                SensorDeviceClass.ENUM,
-                PORT_STATUS_STRINGS,
-                None,
-            )
+        super().__init__(
+            dispatcher, description.key, min_write_interval, description.static
         )
+        self._deadband_absolute = deadband_absolute
+        self._deadband_percent = deadband_percent
 
-    # AC output timer
-    if type(device) in [C300, C800, C1000]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "AC Timer",
-                None,
-                "ac_timer",
-                SensorDeviceClass.TIMESTAMP,
-                state_class=None,
-            )
-        )
+        self.entity_description = description
+        self._attr_unique_id = f"{self._address}_{description.key}"
 
-    # Solar power in
-    if type(device) in [C300, C300DC, C800, C1000, C1000G2, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Solar Power In",
-                "W",
-                "solar_power_in",
-                SensorDeviceClass.POWER,
-            )
-        )
+        # Converter from the API value to the native value chosen once
+        # up front, along with the last API value it was used on
+        self._convert = _get_converter(description)
+        self._last_attribute_value: Any = _UNSET
+        self._stale = False
+        self._update_updatable_attributes()
 
-    # DC power out
-    if type(device) in [C300, C300DC, C1000G2]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "DC Power Out",
-                "W",
-                "dc_power_out",
-                SensorDeviceClass.POWER,
-            )
-        )
+        # Show the last known state until the device is available
+        store = dispatcher.store
+        if (
+            store is not None
+            and description.key in store.states
+            and not dispatcher.available
+        ):
+            self._restore_state(store.states[description.key])
 
-    # DC/Solar power in status
-    if type(device) in [C300DC]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Status Solar",
-                None,
-                "solar_port",
-                SensorDeviceClass.ENUM,
-                PORT_STATUS_STRINGS,
-                None,
-            )
-        )
-
-    # DC power out status
-    # TODO: Reenable for C1000 when underlying library fixes
-    if type(device) in [C300, C1000G2, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Status DC Out",
-                None,
-                "dc_output",
-                SensorDeviceClass.ENUM,
-                PORT_STATUS_STRINGS,
-                None,
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+        await super().async_added_to_hass()
+        if (store := self._dispatcher.store) is not None:
+            self.async_on_remove(
+                store.async_track_state(self.entity_description.key, self._stored_state)
             )
-        )
 
-    # DC Timer
-    if type(device) in [C300, C300DC]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "DC Timer",
-                None,
-                "dc_timer",
-                SensorDeviceClass.TIMESTAMP,
-                state_class=None,
-            )
-        )
+    def _restore_state(self, state: Any) -> None:
+        """Show a state kept from before a restart, marked as stale."""
+        if self.entity_description.device_class is SensorDeviceClass.TIMESTAMP:
+            state = None if state is None else parse_datetime(state)
 
-    # USB C1 power out
-    if type(device) in [C300, C300DC, C800, C1000, C1000G2, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "USB C1 Power",
-                "W",
-                "usb_c1_power",
-                SensorDeviceClass.POWER,
-            )
-        )
+        self._stale = True
+        self._attr_available = True
+        self._attr_native_value = state
+        self._attr_extra_state_attributes = {ATTR_STALE: True}
 
-    # USB C2 power out
-    if type(device) in [C300, C300DC, C800, C1000, C1000G2, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "USB C2 Power",
-                "W",
-                "usb_c2_power",
-                SensorDeviceClass.POWER,
-            )
-        )
+    def _stored_state(self) -> Any:
+        """Return the state to keep for after a restart."""
+        if self._stale or not self._attr_available:
+            return NO_STATE
+        return self._attr_native_value
 
-    # USB C3 power out
-    if type(device) in [C300, C300DC, C1000G2, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "USB C3 Power",
-                "W",
-                "usb_c3_power",
-                SensorDeviceClass.POWER,
-            )
+    def _update_updatable_attributes(self) -> None:
+        """Update this entities updatable attrs from the devices state."""
+        if self._stale:
+            if not self._dispatcher.available:
+                return
+
+            # Replace the stale state with the live one, even if equal
+            self._stale = False
+            self._attr_extra_state_attributes = {}
+            self._last_attribute_value = _UNSET
+            self._last_written_state = None
+
+        self._attr_available = self._dispatcher.available
+
+        # The dispatcher keeps the same object while the value is unchanged
+        attribute_value = self._dispatcher.get(self._state_attribute)
+        if attribute_value is not self._last_attribute_value:
+            self._last_attribute_value = attribute_value
+            self._attr_native_value = self._convert(attribute_value)
+
+    def _rendered_value(self) -> Any:
+        """Return the value HA will render as the state of this entity."""
+        return self._attr_native_value
+
+    def _is_significant_change(self, old_value: Any, new_value: Any) -> bool:
+        """Return if a change in value is outside of the deadband."""
+        return _outside_deadband(
+            old_value, new_value, self._deadband_absolute, self._deadband_percent
         )
 
-    # USB C4 power out
-    if type(device) in [C300DC]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "USB C4 Power",
-                "W",
-                "usb_c4_power",
-                SensorDeviceClass.POWER,
-            )
-        )
 
-    # USB A1 power out
-    if type(device) in [C300, C300DC, C800, C1000, C1000G2, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "USB A1 Power",
-                "W",
-                "usb_a1_power",
-                SensorDeviceClass.POWER,
-            )
-        )
+class SolixDerivedSensorEntity(SolixBLEEntity, SensorEntity):
+    """Representation of a value calculated from other attributes of a device.
 
-    # USB A2 power out
-    if type(device) in [C300DC, C800, C1000, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "USB A2 Power",
-                "W",
-                "usb_a2_power",
-                SensorDeviceClass.POWER,
-            )
-        )
+    Subscribed to every input, but the dispatcher only runs the update once
+    per packet however many of them changed, so the value is calculated
+    once per packet.
+    """
 
-    # USB C1 status
-    if type(device) in [C300, C300DC, C1000G2, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Status USB C1",
-                None,
-                "usb_port_c1",
-                SensorDeviceClass.ENUM,
-                PORT_STATUS_STRINGS,
-                None,
-            )
-        )
+    entity_description: SolixDerivedSensorEntityDescription
 
-    # USB C2 status
-    if type(device) in [C300, C300DC, C1000G2, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Status USB C2",
-                None,
-                "usb_port_c2",
-                SensorDeviceClass.ENUM,
-                PORT_STATUS_STRINGS,
-                None,
-            )
-        )
+    def __init__(
+        self,
+        dispatcher: SolixBLEDispatcher,
+        description: SolixDerivedSensorEntityDescription,
+        inputs: tuple[str, ...],
+        min_write_interval: float = 0,
+        deadband_absolute: float = 0,
+        deadband_percent: float = 0,
+    ) -> None:
+        """Initialize the sensor entity. Does not connect.
+
+        :param dispatcher: The dispatcher of the device.
+        :param description: Description of the sensor entity.
+        :param inputs: Names of the attributes the value is calculated from.
+        :param min_write_interval: Minimum time in seconds between state writes.
+        :param deadband_absolute: Changes of this size or smaller are deferred.
+        :param deadband_percent: Changes of this percentage or smaller are deferred.
+        """
+        super().__init__(dispatcher, None, min_write_interval)
+        self._inputs = inputs
+        self._deadband_absolute = deadband_absolute
+        self._deadband_percent = deadband_percent
+        self.entity_description = description
+        self._attr_unique_id = f"{self._address}_{description.key}"
+        self._update_updatable_attributes()
 
-    # USB C3 status
-    if type(device) in [C300, C300DC, C1000G2, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Status USB C3",
-                None,
-                "usb_port_c3",
-                SensorDeviceClass.ENUM,
-                PORT_STATUS_STRINGS,
-                None,
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+        await super().async_added_to_hass()
+        for attribute in self._inputs:
+            self.async_on_remove(
+                self._dispatcher.async_subscribe(attribute, self._state_change_callback)
             )
-        )
 
-    # USB C4 status
-    if type(device) in [C300DC]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Status USB C4",
-                None,
-                "usb_port_c4",
-                SensorDeviceClass.ENUM,
-                PORT_STATUS_STRINGS,
-                None,
-            )
+    def _update_updatable_attributes(self) -> None:
+        """Calculate the value from the latest snapshot of the inputs."""
+        self._attr_available = self._dispatcher.available
+        values = {}
+        for attribute in self._inputs:
+            value = self._dispatcher.get(attribute)
+            if type(value) not in (int, float):
+                self._attr_native_value = None
+                return
+            values[attribute] = value
+
+        self._attr_native_value = self.entity_description.value_fn(values)
+
+    def _rendered_value(self) -> Any:
+        """Return the value HA will render as the state of this entity."""
+        return self._attr_native_value
+
+    def _is_significant_change(self, old_value: Any, new_value: Any) -> bool:
+        """Return if a change in value is outside of the deadband."""
+        return _outside_deadband(
+            old_value, new_value, self._deadband_absolute, self._deadband_percent
         )
 
-    # USB A1 status
-    if type(device) in [C300, C300DC, C1000G2, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Status USB A1",
-                None,
-                "usb_port_a1",
-                SensorDeviceClass.ENUM,
-                PORT_STATUS_STRINGS,
-                None,
-            )
-        )
 
-    # USB A2 status
-    if type(device) in [C300DC, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Status USB A2",
-                None,
-                "usb_port_a2",
-                SensorDeviceClass.ENUM,
-                PORT_STATUS_STRINGS,
-                None,
-            )
-        )
+class SolixEstimateSensorEntity(SolixBLEEntity, SensorEntity):
+    """Representation of the estimated time until the battery is full or empty.
 
-    # Overload status
-    if type(device) in [C300DC]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Overload Status",
-                None,
-                "device_overload",
-                SensorDeviceClass.ENUM,
-                OVERLOAD_STATUS_C300DC_STRINGS,
-                None,
-            )
-        )
+    Every reading of the battery percentage and power out is added to the
+    estimator, and the readings are also added at a fixed interval so a
+    steady percentage is counted. The readings are forgotten while the
+    device is unavailable.
+    """
 
-    # Light status
-    if type(device) in [C300, C300DC]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Status Light",
-                None,
-                "light",
-                SensorDeviceClass.ENUM,
-                LIGHT_STATUS_STRINGS,
-                None,
-            )
-        )
+    entity_description: SolixEstimateSensorEntityDescription
 
-    # Display status
-    if type(device) in [C300DC]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Display Status",
-                None,
-                "display_mode",
-                SensorDeviceClass.ENUM,
-                LIGHT_STATUS_STRINGS,
-                None,
-            )
-        )
+    def __init__(
+        self,
+        dispatcher: SolixBLEDispatcher,
+        description: SolixEstimateSensorEntityDescription,
+        power_key: str | None,
+        window: float,
+        min_write_interval: float = 0,
+        deadband_absolute: float = 0,
+        deadband_percent: float = 0,
+    ) -> None:
+        """Initialize the sensor entity. Does not connect.
+
+        :param dispatcher: The dispatcher of the device.
+        :param description: Description of the sensor entity.
+        :param power_key: Name of the power out attribute or None if there is none.
+        :param window: Time in seconds the readings are smoothed over.
+        :param min_write_interval: Minimum time in seconds between state writes.
+        :param deadband_absolute: Changes of this size or smaller are deferred.
+        :param deadband_percent: Changes of this percentage or smaller are deferred.
+        """
+        super().__init__(dispatcher, "battery_percentage", min_write_interval)
+        self._power_key = power_key
+        self._estimator = SolixBLERemainingTimeEstimator(window)
+        self._deadband_absolute = deadband_absolute
+        self._deadband_percent = deadband_percent
+        self.entity_description = description
+        self._attr_unique_id = f"{self._address}_{description.key}"
 
-    # Firmware version
-    if type(device) in [C300, C300DC, C800, C1000, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Firmware Version",
-                None,
-                "software_version",
-                state_class=None,
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+        await super().async_added_to_hass()
+        if self._power_key is not None:
+            self.async_on_remove(
+                self._dispatcher.async_subscribe(
+                    self._power_key, self._state_change_callback
+                )
             )
-        )
-
-    # Serial number
-    if type(device) in [C300, C300DC, C800, C1000, C1000G2, F2000, F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Serial Number",
-                None,
-                "serial_number",
-                state_class=None,
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_sample_interval,
+                timedelta(seconds=ESTIMATE_SAMPLE_INTERVAL),
             )
         )
 
-    # Expansion battery temperature sensor
-    if type(device) in [C1000, F2000]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Expansion Battery Temperature",
-                UnitOfTemperature.CELSIUS,
-                "temperature_expansion",
-                SensorDeviceClass.TEMPERATURE,
-            )
-        )
+    @callback
+    def _async_sample_interval(self, _now: datetime) -> None:
+        """Add the current readings while the device sends nothing new."""
+        self._state_change_callback()
 
-    # Expansion battery percentage
-    if type(device) in [C1000, F2000]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Expansion Battery Percentage",
-                "%",
-                "battery_percentage_expansion",
-                SensorDeviceClass.BATTERY,
-            )
+    def _update_updatable_attributes(self) -> None:
+        """Add the latest readings to the estimate."""
+        self._attr_available = self._dispatcher.available
+        percentage = self._dispatcher.get(self._state_attribute)
+        if not self._attr_available or type(percentage) not in (int, float):
+            self._estimator.clear()
+            self._attr_native_value = None
+            return
+
+        power = (
+            self._dispatcher.get(self._power_key)
+            if self._power_key is not None
+            else None
         )
-
-    # Average battery percentage across all batteries
-    if type(device) in [F3800]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Average Battery Percentage",
-                "%",
-                "battery_percentage_aggregate",
-                SensorDeviceClass.BATTERY,
-            )
+        self._estimator.add(
+            percentage, power if type(power) in (int, float) else None, monotonic()
         )
 
-    # Expansion battery health
-    if type(device) in [C1000, F2000]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Expansion Battery Health",
-                "%",
-                "battery_health_expansion",
-                SensorDeviceClass.BATTERY,
-            )
+        hours = self._estimator.hours_remaining
+        self._attr_native_value = (
+            None if hours is None else self.entity_description.value_fn(hours)
         )
 
-    # Expansion battery firmware version
-    if type(device) in [C1000, F2000]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Expansion Battery Firmware Version",
-                None,
-                "software_version_expansion",
-                state_class=None,
-            )
-        )
+    def _rendered_value(self) -> Any:
+        """Return the value HA will render as the state of this entity."""
+        return self._attr_native_value
 
-    # Number of expansion batteries
-    if type(device) in [C1000, F2000]:
-        sensors.append(
-            SolixSensorEntity(
-                device,
-                "Number Of Expansion Batteries",
-                None,
-                "num_expansion",
-            )
+    def _is_significant_change(self, old_value: Any, new_value: Any) -> bool:
+        """Return if a change in value is outside of the deadband."""
+        return _outside_deadband(
+            old_value, new_value, self._deadband_absolute, self._deadband_percent
         )
 
-    async_add_entities(sensors)
 
+class SolixEnergySensorEntity(SolixBLEEntity, RestoreSensor):
+    """Representation of the energy through a power sensor of a device.
 
-class SolixSensorEntity(SensorEntity):
-    """Representation of a device."""
+    The power is integrated with the trapezoidal rule each time the device
+    reports it, before the power sensor applies its write interval or
+    deadband. While connected, the power is also integrated at a fixed
+    interval so the energy keeps increasing while the power is steady.
+    Gaps while the device is disconnected are not integrated, except
+    between the snapshots of rotating connections where the power is
+    assumed to change linearly. The total is restored after a restart.
+    """
 
-    _attr_has_entity_name = True
-    _attr_name = None
+    entity_description: SolixEnergySensorEntityDescription
 
     def __init__(
         self,
-        device: SolixBLEDevice,
-        name: str,
-        unit: str,
-        attribute: str,
-        device_class: SensorDeviceClass | None = None,
-        enum_options: list[str] | None = None,
-        state_class: SensorStateClass = SensorStateClass.MEASUREMENT,
+        dispatcher: SolixBLEDispatcher,
+        supervisor: SolixBLESupervisor,
+        description: SolixEnergySensorEntityDescription,
+        min_write_interval: float = 0,
     ) -> None:
-        """Initialize the device object. Does not connect."""
-
-        self._attribute_name = attribute
-
-        self._device = device
-        self._address = device.address
-        self._attr_name = name
-        self._attr_unique_id = f"{device.address}_{attribute}"
-        self._attr_native_unit_of_measurement = unit
-        self._attr_device_class = device_class
-        self._attr_options = enum_options
-        self._attr_state_class = state_class
-        self._attr_device_info = DeviceInfo(
-            name=device.name,
-            connections={(CONNECTION_BLUETOOTH, device.address)},
-        )
-        self._update_updatable_attributes()
+        """Initialize the sensor entity. Does not connect.
+
+        :param dispatcher: The dispatcher of the device.
+        :param supervisor: The supervisor of the connection to the device.
+        :param description: Description of the sensor entity.
+        :param min_write_interval: Minimum time in seconds between state writes.
+        """
+        super().__init__(dispatcher, description.power_key, min_write_interval)
+        self._supervisor = supervisor
+        self.entity_description = description
+        self._attr_unique_id = f"{self._address}_{description.key}"
+        self._energy: float = 0
+        self._last_power: float | None = None
+        self._last_sample_time: float = 0
 
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
-        self._device.add_callback(self._state_change_callback)
+        if (last_sensor_data := await self.async_get_last_sensor_data()) is not None:
+            try:
+                self._energy = float(last_sensor_data.native_value)
+            except (TypeError, ValueError):
+                pass
+
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_integrate_interval,
+                timedelta(seconds=ENERGY_UPDATE_INTERVAL),
+            )
+        )
 
-    async def async_will_remove_from_hass(self) -> None:
-        """Run when entity will be removed from HA."""
-        self._device.remove_callback(self._state_change_callback)
+        # Integrates up to the moment the connection is lost
+        self.async_on_remove(
+            self._supervisor.async_add_listener(self._state_change_callback)
+        )
+
+    @callback
+    def _async_integrate_interval(self, _now: datetime) -> None:
+        """Integrate the power since the last time it was reported."""
+        # The power held between snapshots is not the power of the device
+        if self._supervisor.rotating and not self._device.connected:
+            return
+        self._state_change_callback()
 
     def _update_updatable_attributes(self) -> None:
-        """Update this entities updatable attrs from the devices state."""
-        self._attr_available = self._device.available
+        """Integrate the power reported by the device."""
+        now = monotonic()
+        self._attr_available = self._dispatcher.available
+        power = (
+            self._dispatcher.get(self._state_attribute)
+            if self._attr_available
+            else None
+        )
+        if type(power) not in (int, float):
+            power = None
 
-        attribute_value = getattr(self._device, self._attribute_name)
+        if power is not None and self._last_power is not None:
+            # Watt seconds to kilowatt hours
+            elapsed = now - self._last_sample_time
+            self._energy += (self._last_power + power) / 2 * elapsed / 3600000
 
-        # If none pass through
-        if attribute_value is None:
-            self._attr_native_value = attribute_value
+        # The power is unknown until the device has reconnected
+        if not self._supervisor.rotating and not self._device.connected:
+            power = None
 
-        # If timestamp add timezone info
-        elif self._attr_device_class is SensorDeviceClass.TIMESTAMP:
-            self._attr_native_value = as_local(attribute_value)
+        self._last_power = power
+        self._last_sample_time = now
 
-        # If enum use enum strings
-        elif self._attr_device_class == SensorDeviceClass.ENUM:
-            self._attr_native_value = self._attr_options[attribute_value.value + 1]
+        # Rounded to watt hours so small increases do not cause writes
+        self._attr_native_value = round(self._energy, 3)
 
-        # Else pass through value
-        else:
-            self._attr_native_value = attribute_value
+    def _rendered_value(self) -> Any:
+        """Return the value HA will render as the state of this entity."""
+        return self._attr_native_value
 
-    def _state_change_callback(self) -> None:
-        """Run when device informs of state update. Updates local properties."""
-        _LOGGER.debug("Received state notification from device %s", self.name)
-        self._update_updatable_attributes()
-        self.async_write_ha_state()
+
+class SolixConnectionSensorEntity(SolixBLEEntity, SensorEntity):
+    """Representation of the health of the connection to a device."""
+
+    entity_description: SolixConnectionSensorEntityDescription
+
+    def __init__(
+        self,
+        dispatcher: SolixBLEDispatcher,
+        supervisor: SolixBLESupervisor,
+        description: SolixConnectionSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor entity.
+
+        :param dispatcher: The dispatcher of the device.
+        :param supervisor: The supervisor of the connection to the device.
+        :param description: Description of the sensor entity.
+        """
+        super().__init__(dispatcher, None, description.min_write_interval)
+        self._supervisor = supervisor
+        self.entity_description = description
+        self._attr_unique_id = f"{self._address}_{description.key}"
+        self._attr_available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._supervisor.async_add_listener(self._state_change_callback)
+        )
+
+    def _update_updatable_attributes(self) -> None:
+        """Update this entities updatable attrs from the supervisor."""
+        self._attr_native_value = self.entity_description.value_fn(self._supervisor)
+
+    def _rendered_value(self) -> Any:
+        """Return the value HA will render as the state of this entity."""
+        return self._attr_native_value
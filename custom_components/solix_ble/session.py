@@ -0,0 +1,107 @@
+"""Handling of negotiated device sessions for SolixBLE."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.hass_dict import HassKey
+from SolixBLE import SolixBLEDevice
+
+from .const import DOMAIN, SESSION_HANDOFF_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingSession:
+    """A connected and negotiated device waiting to be used by a config entry."""
+
+    device: SolixBLEDevice
+    cancel_expiry: CALLBACK_TYPE
+
+
+DATA_PENDING_SESSIONS: HassKey[dict[str, _PendingSession]] = HassKey(
+    f"{DOMAIN}_pending_sessions"
+)
+
+
+@callback
+def _async_get_pending_sessions(hass: HomeAssistant) -> dict[str, _PendingSession]:
+    """Return the pending sessions, creating the store on first use."""
+
+    if (sessions := hass.data.get(DATA_PENDING_SESSIONS)) is not None:
+        return sessions
+
+    sessions = hass.data[DATA_PENDING_SESSIONS] = {}
+
+    async def _async_disconnect_all(event: Event) -> None:
+        """Disconnect any sessions which were never used."""
+        while sessions:
+            _, pending = sessions.popitem()
+            pending.cancel_expiry()
+            await pending.device.disconnect()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_disconnect_all)
+    return sessions
+
+
+@callback
+def async_store_session(hass: HomeAssistant, device: SolixBLEDevice) -> None:
+    """Keep a negotiated device open so a config entry can use it.
+
+    This avoids connecting and negotiating with the device twice when it is
+    set up, once to validate the config flow and once for the config entry.
+    If the session is not used within the TTL the device is disconnected.
+
+    :param hass: Home Assistant instance.
+    :param device: A connected and negotiated device.
+    """
+    sessions = _async_get_pending_sessions(hass)
+    address = device.address.upper()
+
+    if (old := sessions.pop(address, None)) is not None:
+        old.cancel_expiry()
+        hass.async_create_task(old.device.disconnect())
+
+    @callback
+    def _async_expire(_now: datetime) -> None:
+        """Disconnect the session as it was not used in time."""
+        if sessions.get(address) is pending:
+            del sessions[address]
+            _LOGGER.debug("Session with '%s' was not used, disconnecting", address)
+            hass.async_create_task(device.disconnect())
+
+    pending = _PendingSession(
+        device, async_call_later(hass, SESSION_HANDOFF_TTL, _async_expire)
+    )
+    sessions[address] = pending
+
+
+@callback
+def async_pop_session(
+    hass: HomeAssistant, address: str, device_class: type[SolixBLEDevice]
+) -> SolixBLEDevice | None:
+    """Take the pending session for a device if there is a usable one.
+
+    :param hass: Home Assistant instance.
+    :param address: Bluetooth address of the device.
+    :param device_class: Class of the device expected by the caller.
+    :returns: The negotiated device or None.
+    """
+    sessions = hass.data.get(DATA_PENDING_SESSIONS)
+    if not sessions or (pending := sessions.pop(address.upper(), None)) is None:
+        return None
+
+    pending.cancel_expiry()
+    device = pending.device
+
+    if type(device) is not device_class or not device.negotiated:
+        hass.async_create_task(device.disconnect())
+        return None
+
+    return device
@@ -0,0 +1,276 @@
+"""Long-term statistics of power attributes for SolixBLE."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from functools import partial
+from time import monotonic
+from typing import Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import PowerConverter
+
+from .const import DOMAIN
+from .dispatcher import SolixBLEDispatcher
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:
+    # Before Home Assistant 2025.6 statistics only had has_mean
+    StatisticMeanType = None
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _HourlyAggregate:
+    """Time weighted mean, minimum and maximum of a value over an hour."""
+
+    def __init__(self, start: datetime) -> None:
+        """Initialize the aggregate.
+
+        :param start: Start of the hour.
+        """
+        self._value: float | None = None
+        self._value_time: float = 0
+        self._reset(start)
+
+    def add(self, value: float | None, now: float) -> None:
+        """Add a reading, the previous reading is held until now.
+
+        :param value: The reading or None if there is none.
+        :param now: Monotonic time of the reading.
+        """
+        self._hold(now)
+        self._value = value
+        if value is not None:
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def finish(self, now: float, next_start: datetime) -> StatisticData | None:
+        """Finish the hour and start the next one with the current reading.
+
+        :param now: Monotonic time of the end of the hour.
+        :param next_start: Start of the next hour.
+        :returns: Statistics of the hour or None if there were no readings.
+        """
+        self._hold(now)
+        statistic = None
+        if self._duration > 0:
+            statistic = StatisticData(
+                start=self.start,
+                mean=self._weighted_sum / self._duration,
+                min=self.min,
+                max=self.max,
+            )
+
+        self._reset(next_start)
+        self.add(self._value, now)
+        return statistic
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the aggregate of the hour so far.
+
+        :param now: Monotonic time the previous reading is held until.
+        :returns: The aggregate, which can be restored with restore.
+        """
+        self._hold(now)
+        return {
+            "start": self.start.isoformat(),
+            "weighted_sum": self._weighted_sum,
+            "duration": self._duration,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    def restore(self, saved: dict[str, Any]) -> StatisticData | None:
+        """Carry on from an aggregate saved before a restart.
+
+        :param saved: The aggregate returned by as_dict.
+        :returns: Statistics of the saved hour if it has already ended, or
+        None if it is carried on or has no readings.
+        """
+        try:
+            start = dt_util.parse_datetime(saved["start"])
+            weighted_sum = float(saved["weighted_sum"])
+            duration = float(saved["duration"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if start is None or start > self.start:
+            return None
+
+        if start == self.start:
+            self._weighted_sum = weighted_sum
+            self._duration = duration
+            self.min = saved.get("min")
+            self.max = saved.get("max")
+            return None
+
+        # Finished here as it was never added when the hour ended
+        if duration <= 0:
+            return None
+        return StatisticData(
+            start=start,
+            mean=weighted_sum / duration,
+            min=saved.get("min"),
+            max=saved.get("max"),
+        )
+
+    def _reset(self, start: datetime) -> None:
+        """Forget the readings and start a new hour."""
+        self.start = start
+        self.min: float | None = None
+        self.max: float | None = None
+        self._weighted_sum: float = 0
+        self._duration: float = 0
+
+    def _hold(self, now: float) -> None:
+        """Add the previous reading for the time until now."""
+        if self._value is not None:
+            elapsed = now - self._value_time
+            self._weighted_sum += self._value * elapsed
+            self._duration += elapsed
+        self._value_time = now
+
+
+class SolixBLEStatistics:
+    """Hourly statistics of power attributes without recording their states.
+
+    Every reading of the attributes is aggregated in memory and the mean,
+    minimum and maximum of each hour are added to the long-term statistics
+    as external statistics, so no state is written per reading. The
+    aggregate of the current hour is kept in the store of the device, so
+    a restart within the hour does not replace the statistics of the hour
+    with those of the part after the restart.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        dispatcher: SolixBLEDispatcher,
+        names: dict[str, str],
+    ) -> None:
+        """Initialize the statistics. Does not subscribe to the device.
+
+        :param hass: Home Assistant instance.
+        :param dispatcher: The dispatcher of the device.
+        :param names: Names of the statistics by attribute name.
+        """
+        self.hass = hass
+        self.dispatcher = dispatcher
+        self._names = names
+        self._aggregates: dict[str, _HourlyAggregate] = {}
+        self._unsubscribes: list[CALLBACK_TYPE] = []
+
+        object_prefix = dispatcher.device.address.lower().replace(":", "")
+        self._statistic_ids = {
+            attribute: f"{DOMAIN}:{object_prefix}_{attribute}" for attribute in names
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Start aggregating the attributes."""
+        start = _hour_start(dt_util.utcnow())
+        now = monotonic()
+        store = self.dispatcher.store
+        saved = store.statistics if store is not None else {}
+        for attribute in self._names:
+            aggregate = self._aggregates[attribute] = _HourlyAggregate(start)
+            if (saved_aggregate := saved.get(attribute)) is not None and (
+                statistic := aggregate.restore(saved_aggregate)
+            ) is not None:
+                self._async_add_statistic(attribute, statistic)
+            aggregate.add(self._read(attribute), now)
+            self._unsubscribes.append(
+                self.dispatcher.async_subscribe(
+                    attribute, partial(self._async_update, attribute)
+                )
+            )
+        self._unsubscribes.append(
+            async_track_utc_time_change(
+                self.hass, self._async_hour_passed, minute=0, second=0
+            )
+        )
+        if store is not None:
+            self._unsubscribes.append(
+                store.async_track_statistics(self._saved_aggregates)
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop aggregating, adding the statistics of the hour so far."""
+        while self._unsubscribes:
+            self._unsubscribes.pop()()
+        self._async_add_statistics(dt_util.utcnow() + timedelta(hours=1))
+        self._aggregates.clear()
+
+    def _saved_aggregates(self) -> dict[str, Any]:
+        """Return the aggregates of the hour so far by attribute name."""
+        now = monotonic()
+        return {
+            attribute: aggregate.as_dict(now)
+            for attribute, aggregate in self._aggregates.items()
+        }
+
+    @callback
+    def _async_update(self, attribute: str) -> None:
+        """Add the latest reading of an attribute."""
+        self._aggregates[attribute].add(self._read(attribute), monotonic())
+
+    @callback
+    def _async_hour_passed(self, now: datetime) -> None:
+        """Add the statistics of the hour which has just ended."""
+        self._async_add_statistics(now)
+
+    @callback
+    def _async_add_statistics(self, now: datetime) -> None:
+        """Finish the current hour of every attribute and add its statistics.
+
+        :param now: Time within the hour after the one being finished.
+        """
+        next_start = _hour_start(now)
+        monotonic_now = monotonic()
+        for attribute, aggregate in self._aggregates.items():
+            if (statistic := aggregate.finish(monotonic_now, next_start)) is not None:
+                self._async_add_statistic(attribute, statistic)
+
+    @callback
+    def _async_add_statistic(self, attribute: str, statistic: StatisticData) -> None:
+        """Add the statistics of an hour of an attribute."""
+        _LOGGER.debug("Adding statistics of '%s' for %s", attribute, statistic["start"])
+        async_add_external_statistics(
+            self.hass, self._metadata(attribute), (statistic,)
+        )
+
+    def _metadata(self, attribute: str) -> StatisticMetaData:
+        """Return the metadata of the statistics of an attribute."""
+        metadata = StatisticMetaData(
+            has_sum=False,
+            name=self._names[attribute],
+            source=DOMAIN,
+            statistic_id=self._statistic_ids[attribute],
+            unit_of_measurement=UnitOfPower.WATT,
+        )
+        if StatisticMeanType is None:
+            metadata["has_mean"] = True
+        else:
+            metadata["mean_type"] = StatisticMeanType.ARITHMETIC
+            metadata["unit_class"] = PowerConverter.UNIT_CLASS
+        return metadata
+
+    def _read(self, attribute: str) -> float | None:
+        """Return the reading of an attribute or None if there is none."""
+        if not self.dispatcher.available:
+            return None
+        value = self.dispatcher.get(attribute)
+        return value if type(value) in (int, float) else None
+
+
+def _hour_start(time: datetime) -> datetime:
+    """Return the start of the hour containing a time."""
+    return time.replace(minute=0, second=0, microsecond=0)
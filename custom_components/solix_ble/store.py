@@ -0,0 +1,163 @@
+"""Persisted cache of device information for SolixBLE."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    STATE_RESTORE_MAX_AGE,
+    STATE_SAVE_INTERVAL,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+# Returned by a state function when the entity has no state worth keeping
+NO_STATE = object()
+
+
+class SolixBLEStore:
+    """Last known information of a device kept across restarts.
+
+    This allows information which practically never changes, such as the
+    serial number and firmware version, to be known before connecting.
+
+    The last known states of entities are also kept so they can be shown
+    straight away after a restart rather than waiting for the device to
+    connect. They are saved at most every few minutes while they change
+    and when Home Assistant stops, each with the time it was last known.
+    Only the states of entities which are still tracked are saved.
+
+    The hourly statistics aggregated so far are kept as well, so the hour
+    can be finished after a restart rather than starting over.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store. Does not load.
+
+        :param hass: Home Assistant instance.
+        :param entry_id: ID of the config entry of the device.
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self.static: dict[str, Any] = {}
+        self.states: dict[str, Any] = {}
+
+        # Saved states along with the time they were last known, by key
+        self._saved_states: dict[str, dict[str, Any]] = {}
+        self._state_functions: dict[str, Callable[[], Any]] = {}
+        self.statistics: dict[str, Any] = {}
+        self._statistics_function: Callable[[], dict[str, Any]] | None = None
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """Load the cached information from disk."""
+        data = await self._store.async_load() or {}
+        self.static = data.get("static", {})
+        self.statistics = data.get("statistics", {})
+
+        now = dt_util.utcnow()
+        for key, saved in data.get("states", {}).items():
+            if not isinstance(saved, dict) or "state" not in saved:
+                continue
+            saved_at = dt_util.parse_datetime(saved.get("saved_at", ""))
+            if (
+                saved_at is not None
+                and (now - saved_at).total_seconds() < STATE_RESTORE_MAX_AGE
+            ):
+                self._saved_states[key] = saved
+                self.states[key] = saved["state"]
+
+    @callback
+    def async_update_static(self, values: dict[str, Any]) -> None:
+        """Update the cached static attributes, saving them if they changed.
+
+        :param values: Values of static attributes by attribute name.
+        """
+        if values == self.static:
+            return
+        self.static = dict(values)
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_track_state(self, key: str, state_fn: Callable[[], Any]) -> CALLBACK_TYPE:
+        """Keep the state of an entity whenever the states are saved.
+
+        :param key: Key of the entity.
+        :param state_fn: Function returning the state, or NO_STATE to keep
+        the last known one.
+        :returns: Function which stops tracking the state.
+        """
+        self._state_functions[key] = state_fn
+
+        @callback
+        def _untrack() -> None:
+            if self._state_functions.get(key) is state_fn:
+                del self._state_functions[key]
+
+        return _untrack
+
+    @callback
+    def async_track_statistics(
+        self, statistics_fn: Callable[[], dict[str, Any]]
+    ) -> CALLBACK_TYPE:
+        """Keep the hourly statistics so far whenever the states are saved.
+
+        :param statistics_fn: Function returning the statistics.
+        :returns: Function which stops tracking the statistics.
+        """
+        self._statistics_function = statistics_fn
+
+        @callback
+        def _untrack() -> None:
+            if self._statistics_function is statistics_fn:
+                self._statistics_function = None
+
+        return _untrack
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the states of the entities soon if a save is not pending.
+
+        Cheap enough to call on every update, the states are only read when
+        they are saved.
+        """
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, STATE_SAVE_INTERVAL)
+
+    async def async_save(self) -> None:
+        """Save the cached information now rather than after a delay."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the cached information from disk."""
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to be saved."""
+        self._save_pending = False
+        now = dt_util.utcnow().isoformat()
+        saved_states = {}
+        for key, state_fn in self._state_functions.items():
+            if (state := state_fn()) is not NO_STATE:
+                saved_states[key] = {"state": state, "saved_at": now}
+            elif key in self._saved_states:
+                saved_states[key] = self._saved_states[key]
+        self._saved_states = saved_states
+        if self._statistics_function is not None:
+            self.statistics = self._statistics_function()
+
+        return {
+            "static": self.static,
+            "states": saved_states,
+            "statistics": self.statistics,
+        }
@@ -0,0 +1,467 @@
+"""Connection management for SolixBLE."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections.abc import Callable
+from datetime import datetime
+from time import monotonic
+
+from homeassistant.components.bluetooth import (
+    BluetoothChange,
+    BluetoothServiceInfoBleak,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from SolixBLE import SolixBLEDevice
+
+from .const import (
+    CONNECT_RETRY_DELAY_MAX,
+    CONNECT_RETRY_DELAY_MIN,
+    CONNECT_RETRY_JITTER,
+    DEFAULT_SCAN_INTERVAL,
+    DISCONNECT_GRACE_PERIOD,
+    DOMAIN,
+    SNAPSHOT_TIMEOUT,
+)
+from .commands import SolixBLECommandQueue
+from .dispatcher import SolixBLEDispatcher
+from .scheduler import async_get_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SolixBLESupervisor:
+    """Keeps a device connected for the lifetime of a config entry.
+
+    Setting up a config entry does not wait for the device to be found or
+    to connect, instead the entities are added straight away as unavailable and the
+    supervisor connects in the background. When the connection is lost the
+    supervisor reconnects, waiting longer with some jitter after each failed
+    attempt. The wait can be cut short with async_wake, e.g when the device
+    is seen advertising again.
+
+    This replaces the automatic reconnection of the library, which retries
+    at a fixed interval and keeps no record of how the connection is doing.
+    Like the library, entities are only made unavailable if the device does
+    not reconnect within a grace period.
+
+    In rotating mode the device is not kept connected, instead it is
+    connected to every scan interval until the first telemetry arrives and
+    then disconnected, so that more devices can be monitored than there are
+    connection slots. Entities keep the values of the last snapshot.
+
+    Commands are sent over the connection through the command queue of the
+    supervisor so they never overlap.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        dispatcher: SolixBLEDispatcher,
+        rotating: bool = False,
+        scan_interval: float = DEFAULT_SCAN_INTERVAL,
+        found: bool = True,
+    ) -> None:
+        """Initialize the supervisor. Does not connect.
+
+        :param hass: Home Assistant instance.
+        :param entry: Config entry of the device.
+        :param dispatcher: The dispatcher of the device.
+        :param rotating: Only connect to take a snapshot every scan interval.
+        :param scan_interval: Time in seconds between snapshots in rotating mode.
+        :param found: If the device has been heard by an adapter, otherwise it
+        is not connected to until it has been.
+        """
+        self.hass = hass
+        self.entry = entry
+        self.dispatcher = dispatcher
+        self.rotating = rotating
+        self.scan_interval = scan_interval
+        self.device: SolixBLEDevice = dispatcher.device
+        self.scheduler = async_get_scheduler(hass)
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+        self._listeners: list[Callable[[], None]] = []
+        self._cancel_grace_period: CALLBACK_TYPE | None = None
+        self.commands = SolixBLECommandQueue(hass, entry, self.device)
+        self.commands.async_add_listener(self._async_notify_listeners)
+
+        # If the device has been advertising since it was last seen by HA,
+        # only the first advertisement after reappearing wakes the supervisor
+        self._advertising = found
+        self._found = found
+
+        # Health of the connection since the config entry was set up
+        self.last_connect_time: float | None = None
+        self.disconnects = 0
+        self.last_reconnect_time: float | None = None
+        self.unavailable_time: float = 0
+        self._disconnected_at: float | None = None
+
+        # Signal strength of the last advertisement, the device usually
+        # stops advertising while it is connected to
+        self.rssi: int | None = None
+
+    @callback
+    def async_start(self, connected: bool = False) -> None:
+        """Start keeping the device connected in the background.
+
+        :param connected: If the device has already been connected to.
+        """
+        if connected:
+            # Connected by the config flow, which does not use the scheduler
+            details = self.device._ble_device.details
+            self.scheduler.async_mark_connected(
+                self.device.address,
+                details.get("source") if isinstance(details, dict) else None,
+            )
+
+        self._task = self.entry.async_create_background_task(
+            self.hass,
+            (
+                self._async_run_rotating(connected)
+                if self.rotating
+                else self._async_run(connected)
+            ),
+            f"{DOMAIN} supervisor {self.device.address}",
+        )
+
+    async def async_stop(self) -> None:
+        """Stop keeping the device connected. Does not disconnect."""
+        self._async_cancel_grace_period()
+        self.commands.async_stop()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.scheduler.async_release(self.device.address)
+
+    @callback
+    def async_wake(self) -> None:
+        """Make the next connection attempt straight away."""
+        self._wake.set()
+
+    @callback
+    def async_advertisement_received(
+        self, service_info: BluetoothServiceInfoBleak, change: BluetoothChange
+    ) -> None:
+        """Reconnect straight away when the device starts advertising again.
+
+        :param service_info: Advertisement of the device.
+        :param change: Type of the change.
+        """
+        if service_info.rssi != self.rssi:
+            self.rssi = service_info.rssi
+            self._async_notify_listeners()
+
+        if self.device.negotiated:
+            self._advertising = True
+            return
+
+        # Connect through whichever adapter or proxy heard it most recently
+        self.device._ble_device = service_info.device
+        self._found = True
+
+        if not self._advertising:
+            self._advertising = True
+            _LOGGER.debug("Device '%s' is advertising again", self.device.name)
+            self.async_wake()
+
+    @callback
+    def async_device_unavailable(self, service_info: BluetoothServiceInfoBleak) -> None:
+        """Remember that the device has stopped advertising.
+
+        :param service_info: Last advertisement of the device.
+        """
+        self._advertising = False
+        if self.rssi is not None:
+            self.rssi = None
+            self._async_notify_listeners()
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for changes to the health of the connection.
+
+        :param update_callback: Function to run when the health changes.
+        :returns: Function which removes the listener.
+        """
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return _remove_listener
+
+    @callback
+    def _async_notify_listeners(self) -> None:
+        """Run the listeners."""
+        for update_callback in self._listeners:
+            update_callback()
+
+    async def _async_run(self, connected: bool) -> None:
+        """Connect to the device and reconnect whenever the connection is lost.
+
+        :param connected: If the device has already been connected to.
+        """
+
+        # The library starts its own reconnection task when connecting
+        if connected:
+            self._stop_library_reconnect()
+
+        delay = CONNECT_RETRY_DELAY_MIN
+        while True:
+            try:
+                if not connected:
+                    await self._async_connect()
+                    self._stop_library_reconnect()
+                    self._async_connected()
+                delay = CONNECT_RETRY_DELAY_MIN
+
+                # Set by the library when the connection is lost
+                await self.device._disconnect_event.wait()
+                self._async_disconnected()
+            except Exception:
+                _LOGGER.exception(
+                    "Unexpected exception when supervising device '%s'.",
+                    self.device.name,
+                )
+                await self._async_disconnect()
+                await self._async_backoff(delay)
+                delay = min(delay * 2, CONNECT_RETRY_DELAY_MAX)
+            connected = False
+
+    async def _async_run_rotating(self, connected: bool) -> None:
+        """Take a snapshot of the device every scan interval.
+
+        Devices take turns through the scheduler, so devices sharing an
+        adapter are polled round-robin.
+
+        :param connected: If the device has already been connected to.
+        """
+        while True:
+            next_snapshot = monotonic() + self.scan_interval
+
+            snapshot = False
+            try:
+                if connected or await self._async_try_connect():
+                    snapshot = await self._async_wait_for_snapshot()
+                    await self._async_disconnect()
+            except Exception:
+                _LOGGER.exception(
+                    "Unexpected exception when taking a snapshot of device '%s'.",
+                    self.device.name,
+                )
+                await self._async_disconnect()
+            finally:
+                self.scheduler.async_release(self.device.address)
+            connected = False
+
+            # The last snapshot is kept unless this one failed
+            if not snapshot:
+                self.dispatcher.async_refresh()
+
+            await asyncio.sleep(max(next_snapshot - monotonic(), 0))
+
+    async def _async_wait_for_snapshot(self) -> bool:
+        """Wait for the device to send its telemetry.
+
+        :returns: True if telemetry was received before the timeout.
+        """
+        received = asyncio.Event()
+
+        def _state_change_callback() -> None:
+            if self.device.available:
+                received.set()
+
+        _state_change_callback()
+        self.device.add_callback(_state_change_callback)
+        try:
+            async with asyncio.timeout(SNAPSHOT_TIMEOUT):
+                await received.wait()
+        except TimeoutError:
+            _LOGGER.warning(
+                "No telemetry received from '%s' within %is",
+                self.device.name,
+                SNAPSHOT_TIMEOUT,
+            )
+            return False
+        finally:
+            self.device.remove_callback(_state_change_callback)
+
+        return True
+
+    async def _async_connect(self) -> None:
+        """Connect to the device, retrying until it succeeds."""
+        delay = CONNECT_RETRY_DELAY_MIN
+        while True:
+            # Cleared before the attempt so a wake during it is not lost
+            self._wake.clear()
+            if await self._async_try_connect():
+                return
+
+            await self._async_backoff(delay)
+            delay = min(delay * 2, CONNECT_RETRY_DELAY_MAX)
+
+    async def _async_backoff(self, delay: float) -> None:
+        """Wait before retrying the connection, unless woken.
+
+        :param delay: Time in seconds to wait before jitter is applied.
+        """
+        jittered_delay = delay * random.uniform(
+            1 - CONNECT_RETRY_JITTER, 1 + CONNECT_RETRY_JITTER
+        )
+        _LOGGER.debug(
+            "Retrying connection to '%s' in %.1fs",
+            self.device.name,
+            jittered_delay,
+        )
+        try:
+            async with asyncio.timeout(jittered_delay):
+                await self._wake.wait()
+            _LOGGER.debug("Retrying connection to '%s' early", self.device.name)
+        except TimeoutError:
+            pass
+
+    async def _async_try_connect(self) -> bool:
+        """Make a single attempt to connect and negotiate with the device.
+
+        Waits for the turn of the device to connect, as only one device is
+        connected to at a time.
+
+        :returns: True if the device is connected and negotiated.
+        """
+        address = self.device.address
+        if (ble_device := await self.scheduler.async_acquire(address)) is not None:
+            self.device._ble_device = ble_device
+            self._found = True
+        elif not self._found:
+            # There is no path to the device until an adapter has heard it
+            _LOGGER.debug("Device '%s' has not been found yet", self.device.name)
+            self.scheduler.async_attempt_finished(address, False)
+            return False
+
+        connected = False
+        try:
+            connected = await self._async_connect_once()
+        finally:
+            self.scheduler.async_attempt_finished(address, connected)
+
+        return connected
+
+    async def _async_connect_once(self) -> bool:
+        """Connect and negotiate with the device, disconnecting on failure.
+
+        :returns: True if the device is connected and negotiated.
+        """
+        start = monotonic()
+        try:
+            if self.rotating:
+                # Entities keep the last snapshot until the telemetry arrives
+                await self.device.connect(run_callbacks=False)
+            else:
+                await self.device.connect()
+        except Exception:
+            _LOGGER.exception(
+                "Unexpected exception when connecting to device '%s'.",
+                self.device.name,
+            )
+
+        if not self.device.connected:
+            _LOGGER.warning(
+                "Device '%s' found but unable to connect.", self.device.name
+            )
+        elif not self.device.negotiated:
+            _LOGGER.warning(
+                "Device '%s' connected but failed to negotiate encryption.",
+                self.device.name,
+            )
+        else:
+            # Mostly spent negotiating encryption, which can not be skipped
+            # as the device only sends telemetry after a full negotiation
+            self.last_connect_time = monotonic() - start
+            self.dispatcher.async_reread_static()
+            self._async_notify_listeners()
+            return True
+
+        # Drop anything left over from the failed attempt
+        await self._async_disconnect()
+        return False
+
+    async def _async_disconnect(self) -> None:
+        """Disconnect from the device, logging rather than raising errors."""
+        try:
+            await self.device.disconnect()
+        except Exception:
+            _LOGGER.exception(
+                "Unexpected exception when disconnecting from device '%s'.",
+                self.device.name,
+            )
+
+    def _stop_library_reconnect(self) -> None:
+        """Stop the automatic reconnection task of the library.
+
+        The library only starts the task if it has not got one, so the
+        cancelled task is left in place to stop it starting another.
+        """
+        if (task := self.device._auto_reconnect_task) is not None:
+            task.cancel()
+
+    @callback
+    def _async_connected(self) -> None:
+        """Record that the device has reconnected."""
+        self._async_cancel_grace_period()
+        if self._disconnected_at is None:
+            return
+
+        self.last_reconnect_time = monotonic() - self._disconnected_at
+        self.unavailable_time += self.last_reconnect_time
+        self._disconnected_at = None
+        _LOGGER.debug(
+            "Reconnected to '%s' after %.1fs",
+            self.device.name,
+            self.last_reconnect_time,
+        )
+        self._async_notify_listeners()
+
+    @callback
+    def _async_disconnected(self) -> None:
+        """Record that the connection to the device was lost."""
+        self.disconnects += 1
+        self._disconnected_at = monotonic()
+
+        # The device advertises again once it has dropped the connection,
+        # which may be long before HA notices it had stopped advertising
+        self._advertising = False
+        self.scheduler.async_release(self.device.address)
+        _LOGGER.debug("Connection to '%s' lost, reconnecting", self.device.name)
+        self._cancel_grace_period = async_call_later(
+            self.hass, DISCONNECT_GRACE_PERIOD, self._async_grace_period_expired
+        )
+        self._async_notify_listeners()
+
+    @callback
+    def _async_grace_period_expired(self, _now: datetime) -> None:
+        """Make the entities unavailable as the device has not reconnected."""
+        self._cancel_grace_period = None
+        _LOGGER.warning(
+            "Unable to reconnect to '%s' within %is",
+            self.device.name,
+            DISCONNECT_GRACE_PERIOD,
+        )
+        self.dispatcher.async_refresh()
+
+    @callback
+    def _async_cancel_grace_period(self) -> None:
+        """Cancel making the entities unavailable."""
+        if self._cancel_grace_period is not None:
+            self._cancel_grace_period()
+            self._cancel_grace_period = None
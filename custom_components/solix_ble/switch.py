@@ -3,14 +3,24 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from time import monotonic
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.switch import SwitchEntity
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH, DeviceInfo
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from SolixBLE import C300, C800, C1000, PortStatus, SolixBLEDevice
 
+from .commands import SolixBLECommandQueue
+from .const import SWITCH_CONFIRMATION_TIMEOUT
+from .dispatcher import SolixBLEDispatcher
+from .entity import SolixBLEEntity
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -18,6 +28,71 @@ if TYPE_CHECKING:
     from . import SolixBLEConfigEntry
 
 
+@dataclass(frozen=True, kw_only=True)
+class SolixSwitchEntityDescription(SwitchEntityDescription):
+    """Describes a switch and which models support it.
+
+    The key is used in unique ID generation.
+    """
+
+    models: tuple[type[SolixBLEDevice], ...]
+    state_attribute: str | None
+    on_function: str
+    off_function: str
+
+
+SWITCH_DESCRIPTIONS: tuple[SolixSwitchEntityDescription, ...] = (
+    # Support for AC output switch with status
+    SolixSwitchEntityDescription(
+        key="ac_output",
+        name="AC Output",
+        state_attribute="ac_output",
+        on_function="turn_ac_on",
+        off_function="turn_ac_off",
+        models=(C300, C800, C1000),
+    ),
+    # Support for DC output switch with status
+    SolixSwitchEntityDescription(
+        key="dc_output",
+        name="DC Output",
+        state_attribute="dc_output",
+        on_function="turn_dc_on",
+        off_function="turn_dc_off",
+        models=(C300,),
+    ),
+    # Support for DC output switch without status
+    SolixSwitchEntityDescription(
+        key="dc_output",
+        name="DC Output",
+        state_attribute=None,
+        on_function="turn_dc_on",
+        off_function="turn_dc_off",
+        models=(C800, C1000),
+    ),
+    # Support for display on/off switch without status
+    SolixSwitchEntityDescription(
+        key="display_on_off",
+        name="Display",
+        state_attribute=None,
+        on_function="turn_display_on",
+        off_function="turn_display_off",
+        models=(C300, C800, C1000),
+    ),
+)
+
+# Descriptions of the switches supported by each model, built once at import
+SWITCHES_BY_MODEL: dict[
+    type[SolixBLEDevice], tuple[SolixSwitchEntityDescription, ...]
+] = {
+    model: tuple(
+        description
+        for description in SWITCH_DESCRIPTIONS
+        if model in description.models
+    )
+    for model in (C300, C800, C1000)
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: SolixBLEConfigEntry,
@@ -25,141 +100,178 @@ async def async_setup_entry(
 ) -> None:
     """Set up the switches."""
 
-    device = config_entry.runtime_data
-    switches: list[SolixSwitchEntity] = []
-
-    # Support for AC output switch with status
-    if type(device) in [C300, C800, C1000]:
-        switches.append(
-            SolixSwitchEntity(
-                device,
-                "AC Output",
-                "ac_output",
-                "ac_output",
-                "turn_ac_on",
-                "turn_ac_off",
-            )
-        )
+    dispatcher = config_entry.runtime_data.dispatcher
+    commands = config_entry.runtime_data.supervisor.commands
+    async_add_entities(
+        SolixSwitchEntity(dispatcher, commands, description)
+        for description in SWITCHES_BY_MODEL.get(type(dispatcher.device), ())
+    )
 
-    # Support for DC output switch with status
-    if type(device) in [C300]:
-        switches.append(
-            SolixSwitchEntity(
-                device,
-                "DC Output",
-                "dc_output",
-                "dc_output",
-                "turn_dc_on",
-                "turn_dc_off",
-            ),
-        )
 
-    # Support for DC output switch without status
-    if type(device) in [C800, C1000]:
-        switches.append(
-            SolixSwitchEntity(
-                device,
-                "DC Output",
-                "dc_output",
-                None,
-                "turn_dc_on",
-                "turn_dc_off",
-            ),
-        )
+class SolixSwitchEntity(SolixBLEEntity, SwitchEntity):
+    """Representation of a device.
 
-    # Support for display on/off switch without status
-    if type(device) in [C300, C800, C1000]:
-        switches.append(
-            SolixSwitchEntity(
-                device,
-                "Display",
-                "display_on_off",
-                None,
-                "turn_display_on",
-                "turn_display_off",
-            ),
-        )
-
-    async_add_entities(switches)
+    Switching shows the new state straight away. Switches with a state
+    attribute keep showing it until the device reports it, or go back to
+    the reported state if it does not within a timeout. Switches without
+    one can only assume the state they were last switched to.
+    """
 
-
-class SolixSwitchEntity(SwitchEntity):
-    """Representation of a device."""
-
-    _attr_has_entity_name = True
-    _attr_name = None
+    entity_description: SolixSwitchEntityDescription
 
     def __init__(
         self,
-        device: SolixBLEDevice,
-        name: str,
-        attribute: str,
-        state_attribute: str | None,
-        on_function_attribute: str,
-        off_function_attribute: str,
+        dispatcher: SolixBLEDispatcher,
+        commands: SolixBLECommandQueue,
+        description: SolixSwitchEntityDescription,
     ) -> None:
         """Initialize the device object. Does not connect.
 
-        :param device: The device API object.
-        :param name: Name of the switch entity.
-        :param attribute: Attribute used in unique ID generation.
-        :param state_attribute: Name of function in API object to determine state.
-        :param on_function_attribute: Name of function in API object to turn switch on.
-        :param off_function_attribute: Name of function in API object to turn switch off.
+        :param dispatcher: The dispatcher of the device.
+        :param commands: The command queue of the device.
+        :param description: Description of the switch entity.
         """
-        self._device = device
-        self._address = device.address
-        self._state_attribute = state_attribute
-        self._on_function = getattr(device, on_function_attribute)
-        self._off_function = getattr(device, off_function_attribute)
-
-        self._attr_name = name
-        self._attr_unique_id = f"{device.address}_{attribute}"
-        self._attr_device_info = DeviceInfo(
-            name=device.name,
-            connections={(CONNECTION_BLUETOOTH, device.address)},
-        )
+        super().__init__(dispatcher, description.state_attribute)
+        self._commands = commands
+        self._on_function = getattr(self._device, description.on_function)
+        self._off_function = getattr(self._device, description.off_function)
+        self._attr_assumed_state = description.state_attribute is None
+
+        # State switched to which the device has not reported yet
+        self._expected: bool | None = None
+        self._expected_command = ""
+        self._switched_at: float = 0
+        self._cancel_confirmation: CALLBACK_TYPE | None = None
+
+        self.entity_description = description
+        self._attr_unique_id = f"{self._address}_{description.key}"
         self._update_updatable_attributes()
 
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
-        self._device.add_callback(self._state_change_callback)
-
-    async def async_will_remove_from_hass(self) -> None:
-        """Run when entity will be removed from HA."""
-        self._device.remove_callback(self._state_change_callback)
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_confirmation)
 
     def _update_updatable_attributes(self) -> None:
         """Update this entities updatable attrs from the devices state."""
-        self._attr_available = self._device.available
+        self._attr_available = self._dispatcher.available
 
         if self._state_attribute is not None:
-            state = getattr(self._device, self._state_attribute)
-
-            if type(state) is PortStatus:
-                if state is PortStatus.UNKNOWN:
-                    self._attr_is_on = None
-                elif state is PortStatus.NOT_CONNECTED:
-                    self._attr_is_on = False
-                elif state is PortStatus.OUTPUT:
-                    self._attr_is_on = True
+            is_on = self._reported_is_on()
+
+            if self._expected is not None:
+                if is_on is self._expected:
+                    self._async_confirmed()
                 else:
-                    raise RuntimeError(
-                        f"Unexpected port status '{state}' with type '{type(state)}'!"
-                    )
+                    # Telemetry sent before the switch took effect
+                    is_on = self._expected
+
+            self._attr_is_on = is_on
+
+    def _reported_is_on(self) -> bool | None:
+        """Return the state of the switch reported by the device."""
+        state = self._dispatcher.get(self._state_attribute)
+
+        if type(state) is PortStatus:
+            if state is PortStatus.UNKNOWN:
+                return None
+            elif state is PortStatus.NOT_CONNECTED:
+                return False
+            elif state is PortStatus.OUTPUT:
+                return True
             else:
-                self._attr_is_on = state
+                raise RuntimeError(
+                    f"Unexpected port status '{state}' with type '{type(state)}'!"
+                )
+        return state
 
-    def _state_change_callback(self) -> None:
-        """Run when device informs of state update. Updates local properties."""
-        _LOGGER.debug("Received state notification from device %s", self.name)
-        self._update_updatable_attributes()
-        self.async_write_ha_state()
+    def _rendered_value(self) -> Any:
+        """Return the value HA will render as the state of this entity."""
+        return self._attr_is_on
 
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
-        await self._on_function()
+        await self._async_switch(
+            True, self.entity_description.on_function, self._on_function
+        )
 
     async def async_turn_off(self, **kwargs):
-        """Turn the entity on."""
-        await self._off_function()
+        """Turn the entity off."""
+        await self._async_switch(
+            False, self.entity_description.off_function, self._off_function
+        )
+
+    async def _async_switch(
+        self, is_on: bool, name: str, function: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Show the new state straight away and send the command to the device.
+
+        :param is_on: State being switched to.
+        :param name: Name of the command.
+        :param function: Function sending the command.
+        :raises HomeAssistantError: If sending the command failed.
+        """
+        previous = self._attr_is_on
+        self._async_cancel_confirmation()
+        if self._state_attribute is not None:
+            self._expected = is_on
+            self._expected_command = name
+            self._switched_at = monotonic()
+        self._attr_is_on = is_on
+        self._async_write_ha_state_if_changed()
+
+        try:
+            await self._commands.async_send(self.entity_description.key, name, function)
+        except HomeAssistantError:
+            if self._expected is is_on:
+                self._expected = None
+                self._update_updatable_attributes()
+            elif self._state_attribute is None:
+                self._attr_is_on = previous
+            self._async_write_ha_state_if_changed()
+            raise
+
+        # Commands replacing each other each get here once they are sent
+        if self._expected is is_on:
+            # The device will not report a change if it was already in the
+            # state switched to
+            if self._reported_is_on() is is_on:
+                self._async_confirmed()
+                return
+
+            self._async_cancel_confirmation()
+            self._cancel_confirmation = async_call_later(
+                self.hass,
+                SWITCH_CONFIRMATION_TIMEOUT,
+                self._async_confirmation_expired,
+            )
+
+    @callback
+    def _async_confirmed(self) -> None:
+        """Stop waiting for the device to report the state switched to."""
+        self._expected = None
+        self._async_cancel_confirmation()
+        self._commands.async_confirmed(
+            self._expected_command, monotonic() - self._switched_at
+        )
+
+    @callback
+    def _async_confirmation_expired(self, _now: datetime) -> None:
+        """Go back to the reported state as the device has not switched."""
+        self._cancel_confirmation = None
+        self._expected = None
+        _LOGGER.warning(
+            "'%s' did not report '%s' taking effect within %is",
+            self._device.name,
+            self._expected_command,
+            SWITCH_CONFIRMATION_TIMEOUT,
+        )
+        self._update_updatable_attributes()
+        self._async_write_ha_state_if_changed()
+
+    @callback
+    def _async_cancel_confirmation(self) -> None:
+        """Cancel going back to the reported state."""
+        if self._cancel_confirmation is not None:
+            self._cancel_confirmation()
+            self._cancel_confirmation = None
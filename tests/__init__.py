@@ -1,13 +1,17 @@
 """Tests for the SolixBLE Bluetooth integration."""
 
+from collections.abc import Generator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
+from unittest.mock import PropertyMock, patch
 
 from bleak.backends.scanner import AdvertisementData, BLEDevice
 from habluetooth import BluetoothServiceInfoBleak
-from SolixBLE import LightStatus, PortStatus
+from SolixBLE import LightStatus, PortStatus, SolixBLEDevice
 
+from custom_components.solix_ble import get_power_station_class
 from custom_components.solix_ble.const import Models
 
 # Copied from HA Bluetooth tests
@@ -91,6 +95,53 @@ class MockDeviceDetails:
         )
 
 
+@dataclass
+class MockConnection:
+    """Device object created by the integration, captured when it connects."""
+
+    device: SolixBLEDevice | None = None
+    available: PropertyMock | None = None
+
+    def update(self) -> None:
+        """Run the state changed callbacks of the device."""
+        self.device._run_state_changed_callbacks()
+
+
+@contextmanager
+def patch_connection(
+    device_details: MockDeviceDetails, available: bool = True
+) -> Generator[MockConnection]:
+    """Patch finding and connecting to a device, capturing the device object.
+
+    :param device_details: Details of the device to connect to.
+    :param available: If the device has sent its telemetry.
+    """
+    connection = MockConnection()
+    device_class = get_power_station_class(Models(device_details.model_class))
+
+    def _connect(self: SolixBLEDevice, *args: Any, **kwargs: Any) -> bool:
+        connection.device = self
+        return True
+
+    with (
+        patch(
+            "custom_components.solix_ble.async_ble_device_from_address",
+            return_value=device_details.get_ble_device(),
+        ),
+        patch("custom_components.solix_ble.async_scanner_count", return_value=1),
+        patch.object(device_class, "connect", autospec=True, side_effect=_connect),
+        patch.object(device_class, "connected", side_effect=[True]),
+        patch.object(device_class, "negotiated", side_effect=[True]),
+        patch(
+            "SolixBLE.SolixBLEDevice.available",
+            new_callable=PropertyMock,
+            return_value=available,
+        ) as mock_available,
+    ):
+        connection.available = mock_available
+        yield connection
+
+
 MOCK_C300_DETAILS = MockDeviceDetails(
     name="Anker SOLIX C300",
     addr="AA:BB:CC:DD:EE:00",
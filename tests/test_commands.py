@@ -0,0 +1,91 @@
+"""Test the command queue for SolixBLE integration."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.solix_ble.commands import SolixBLECommandQueue
+from custom_components.solix_ble.const import DOMAIN
+
+
+def _make_queue(hass: HomeAssistant) -> SolixBLECommandQueue:
+    """Return a command queue of a mock device."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    return SolixBLECommandQueue(hass, entry, MagicMock())
+
+
+async def test_commands_serialised_and_coalesced(hass: HomeAssistant) -> None:
+    """Test that commands never overlap and waiting ones are replaced."""
+
+    queue = _make_queue(hass)
+    listener = MagicMock()
+    queue.async_add_listener(listener)
+    sent: list[str] = []
+    release = asyncio.Event()
+    sending = 0
+
+    def _command(name: str):
+        async def _send() -> None:
+            nonlocal sending
+            sending += 1
+            assert sending == 1, "Commands overlapped!"
+            await release.wait()
+            sent.append(name)
+            sending -= 1
+
+        return _send
+
+    # AC is being sent while the DC is toggled on, off and on again
+    tasks = [
+        hass.async_create_task(queue.async_send(target, name, _command(name)))
+        for target, name in (
+            ("ac_output", "ac_on"),
+            ("dc_output", "dc_on"),
+            ("dc_output", "dc_off"),
+            ("display", "display_on"),
+            ("dc_output", "dc_on_again"),
+        )
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert sent == ["ac_on", "dc_on_again", "display_on"]
+    assert queue.last_latency > 0
+    assert listener.call_count == 3
+
+
+@patch("custom_components.solix_ble.commands.COMMAND_TIMEOUT", 0.01)
+async def test_commands_fail(hass: HomeAssistant) -> None:
+    """Test that failed and timed out commands raise without stopping the queue."""
+
+    queue = _make_queue(hass)
+
+    async def _hang() -> None:
+        await asyncio.sleep(1)
+
+    async def _fail() -> None:
+        raise ConnectionError("Not connected to device")
+
+    async def _succeed() -> None:
+        pass
+
+    with pytest.raises(HomeAssistantError, match="timed out"):
+        await queue.async_send("ac_output", "ac_on", _hang)
+    with pytest.raises(HomeAssistantError, match="Not connected"):
+        await queue.async_send("ac_output", "ac_on", _fail)
+    await queue.async_send("ac_output", "ac_on", _succeed)
+
+    # Stopping fails the commands which are waiting
+    first = hass.async_create_task(queue.async_send("ac_output", "ac_on", _hang))
+    second = hass.async_create_task(queue.async_send("dc_output", "dc_on", _succeed))
+    await asyncio.sleep(0)
+    queue.async_stop()
+    for task in (first, second):
+        with pytest.raises(HomeAssistantError, match="not sent"):
+            await task
@@ -5,12 +5,21 @@ from unittest.mock import AsyncMock, PropertyMock, patch
 
 import pytest
 from homeassistant import config_entries
-from homeassistant.const import CONF_MAC, CONF_NAME
+from homeassistant.const import CONF_MAC, CONF_NAME, CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.helpers import device_registry
 
-from custom_components.solix_ble.const import DOMAIN
+from custom_components.solix_ble.const import (
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_PERCENT,
+    CONF_ESTIMATE_WINDOW,
+    CONF_POWER_STATISTICS,
+    CONF_POWER_WRITE_INTERVAL,
+    CONF_ROTATING,
+    CONF_SENSOR_WRITE_INTERVAL,
+    DOMAIN,
+)
 
 from . import (
     MOCK_C300_DETAILS,
@@ -329,3 +338,90 @@ async def test_bluetooth_form_multiple_set_up(
         CONF_NAME: mock_device_details.name,
         CONF_MAC: mock_device_details.addr,
     }
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry",
+    [pytest.param(MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_options_flow(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the options flow stores the options."""
+
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    options = {
+        CONF_POWER_WRITE_INTERVAL: 10,
+        CONF_SENSOR_WRITE_INTERVAL: 60,
+        CONF_DEADBAND_ABSOLUTE: 2,
+        CONF_DEADBAND_PERCENT: 1,
+        CONF_ESTIMATE_WINDOW: 3600,
+        CONF_POWER_STATISTICS: True,
+        CONF_ROTATING: True,
+        CONF_SCAN_INTERVAL: 600,
+    }
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input=options
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options == options
+
+
+async def test_bluetooth_form_session_reused(hass: HomeAssistant) -> None:
+    """Test the session negotiated by the config flow is used by the config entry."""
+
+    mock_device_details = MOCK_C300_DETAILS
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_BLUETOOTH},
+        data=mock_device_details.get_service_info(),
+    )
+
+    with (
+        patch(
+            "custom_components.solix_ble.config_flow.async_ble_device_from_address",
+            return_value=mock_device_details.get_ble_device(),
+        ),
+        patch(
+            "custom_components.solix_ble.config_flow.async_scanner_count",
+            return_value=1,
+        ),
+        # Setting up the entry would fail if it tried to connect again
+        patch(
+            "custom_components.solix_ble.async_ble_device_from_address",
+            return_value=None,
+        ),
+        patch(
+            "SolixBLE.SolixBLEDevice.connect",
+            side_effect=[True],
+        ) as mock_connect,
+        patch(
+            "SolixBLE.SolixBLEDevice.connected",
+            new_callable=PropertyMock,
+            return_value=True,
+        ),
+        patch(
+            "SolixBLE.SolixBLEDevice.negotiated",
+            new_callable=PropertyMock,
+            return_value=True,
+        ),
+        patch("SolixBLE.SolixBLEDevice.disconnect") as mock_disconnect,
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            flow_id=result["flow_id"],
+            user_input={"device_model": mock_device_details.model_string},
+        )
+        await hass.async_block_till_done()
+
+        assert result["type"] is FlowResultType.CREATE_ENTRY
+        assert result["result"].state is config_entries.ConfigEntryState.LOADED
+        mock_connect.assert_called_once()
+        mock_disconnect.assert_not_called()
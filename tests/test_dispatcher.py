@@ -0,0 +1,197 @@
+"""Test the state update dispatcher for SolixBLE integration."""
+
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.const import EVENT_LOGGING_CHANGED
+from homeassistant.core import HomeAssistant
+
+from custom_components.solix_ble.dispatcher import SolixBLEDispatcher
+
+
+class MockDevice:
+    """Minimal stand in for a device API object."""
+
+    def __init__(self) -> None:
+        self.name = "Mock device"
+        self.available = True
+        self.power_in = 1
+        self.power_out = 2
+        self.callbacks = []
+
+    def add_callback(self, function) -> None:
+        self.callbacks.append(function)
+
+    def remove_callback(self, function) -> None:
+        self.callbacks.remove(function)
+
+    def run_callbacks(self) -> None:
+        for function in self.callbacks:
+            function()
+
+
+async def test_dispatcher_routes_changed_attributes(hass: HomeAssistant) -> None:
+    """Test that only subscribers of changed attributes are notified."""
+
+    device = MockDevice()
+    dispatcher = SolixBLEDispatcher(hass, device)
+    dispatcher.async_start()
+    assert len(device.callbacks) == 1
+
+    power_in_callback = MagicMock()
+    power_out_callback = MagicMock()
+    availability_callback = MagicMock()
+    dispatcher.async_subscribe("power_in", power_in_callback)
+    unsubscribe = dispatcher.async_subscribe("power_out", power_out_callback)
+    dispatcher.async_subscribe(None, availability_callback)
+
+    # Nothing changed
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    power_in_callback.assert_not_called()
+    power_out_callback.assert_not_called()
+    availability_callback.assert_not_called()
+
+    # Only power in changed
+    device.power_in = 5
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    power_in_callback.assert_called_once()
+    power_out_callback.assert_not_called()
+    availability_callback.assert_not_called()
+    assert dispatcher.get("power_in") == 5
+
+    # Availability changed so everything is notified
+    device.available = False
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    assert power_in_callback.call_count == 2
+    power_out_callback.assert_called_once()
+    availability_callback.assert_called_once()
+
+    # Removed subscribers are no longer notified
+    unsubscribe()
+    device.power_out = 7
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    power_out_callback.assert_called_once()
+
+    dispatcher.async_stop()
+    assert len(device.callbacks) == 0
+
+
+async def test_dispatcher_batches_notifications(hass: HomeAssistant) -> None:
+    """Test that packets are read and notified once per loop iteration, not inline."""
+
+    device = MockDevice()
+    dispatcher = SolixBLEDispatcher(hass, device)
+    dispatcher.async_start()
+
+    power_in_callback = MagicMock()
+    dispatcher.async_subscribe("power_in", power_in_callback)
+
+    # Several packets before the event loop gets to run
+    device.power_in = 5
+    device.run_callbacks()
+    device.power_in = 6
+    device.run_callbacks()
+    power_in_callback.assert_not_called()
+
+    # Nothing is read from the device inside the notification handler
+    assert dispatcher.get("power_in") == 1
+
+    await hass.async_block_till_done()
+    power_in_callback.assert_called_once()
+    assert dispatcher.get("power_in") == 6
+
+    # Pending notifications are dropped when stopped
+    device.power_in = 7
+    device.run_callbacks()
+    dispatcher.async_stop()
+    await hass.async_block_till_done()
+    power_in_callback.assert_called_once()
+
+
+async def test_dispatcher_debug_logging(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that one debug line is logged per batch only when debug is enabled."""
+
+    caplog.set_level(logging.INFO, logger="custom_components.solix_ble.dispatcher")
+    device = MockDevice()
+    dispatcher = SolixBLEDispatcher(hass, device)
+    dispatcher.async_start()
+    dispatcher.async_subscribe("power_in", MagicMock())
+
+    # An entity whose state was unchanged by the update
+    def _unchanged() -> None:
+        dispatcher.suppressed_writes += 1
+
+    dispatcher.async_subscribe("power_in", _unchanged)
+
+    device.power_in = 5
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    assert "Updated 2 entities of device Mock device" not in caplog.text
+
+    # Debug logging is only checked when the log level changes
+    caplog.set_level(logging.DEBUG, logger="custom_components.solix_ble.dispatcher")
+    hass.bus.async_fire(EVENT_LOGGING_CHANGED)
+    await hass.async_block_till_done()
+
+    device.power_in = 6
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    assert caplog.text.count("Updated 2 entities of device Mock device") == 1
+    assert "1 unchanged" in caplog.text
+    assert dispatcher.suppressed_writes == 2
+
+    dispatcher.async_stop()
+
+
+async def test_dispatcher_static_attributes(hass: HomeAssistant) -> None:
+    """Test that static attributes are only read once per connection."""
+
+    device = MockDevice()
+    device.available = False
+    device.serial_number = "Unknown"
+    dispatcher = SolixBLEDispatcher(hass, device)
+    dispatcher.async_start()
+
+    serial_number_callback = MagicMock()
+    dispatcher.async_subscribe("serial_number", serial_number_callback, static=True)
+
+    # Connected and the serial number is read
+    device.available = True
+    device.serial_number = "ABC"
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    serial_number_callback.assert_called_once()
+    assert dispatcher.get("serial_number") == "ABC"
+
+    # Further updates do not read it again
+    device.serial_number = "DEF"
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    serial_number_callback.assert_called_once()
+    assert dispatcher.get("serial_number") == "ABC"
+
+    # But it is read again after reconnecting
+    device.available = False
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    device.available = True
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    assert dispatcher.get("serial_number") == "DEF"
+
+    # And after the supervisor has reconnected within the grace period,
+    # when the device never reported being unavailable
+    device.serial_number = "GHI"
+    dispatcher.async_reread_static()
+    device.run_callbacks()
+    await hass.async_block_till_done()
+    assert dispatcher.get("serial_number") == "GHI"
+
+    dispatcher.async_stop()
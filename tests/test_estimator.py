@@ -0,0 +1,49 @@
+"""Test the remaining time estimator for SolixBLE integration."""
+
+import pytest
+
+from custom_components.solix_ble.estimator import SolixBLERemainingTimeEstimator
+
+
+def test_estimator_discharging() -> None:
+    """Test that the rate follows the percentage and is scaled by the power."""
+
+    estimator = SolixBLERemainingTimeEstimator(3600)
+    assert estimator.hours_remaining is None
+
+    # 1% every 6 minutes at 100W is 10% per hour, whole percentages only
+    for minute in range(0, 61):
+        estimator.add(80 - minute // 6, 100, 1000 + minute * 60)
+    assert estimator.hours_remaining == pytest.approx(7, abs=0.1)
+
+    # Doubling the load shortens the estimate before the percentage shows it
+    estimator.add(70, 200, 1000 + 61 * 60)
+    shorter = estimator.hours_remaining
+    assert shorter < 7
+    for minute in range(62, 75):
+        estimator.add(70, 200, 1000 + minute * 60)
+    assert estimator.hours_remaining < shorter
+
+
+def test_estimator_charging_and_window() -> None:
+    """Test charging and that readings drop out of the window."""
+
+    estimator = SolixBLERemainingTimeEstimator(600)
+
+    # Too short a span to estimate
+    estimator.add(50, 0, 0)
+    estimator.add(50, 0, 60)
+    assert estimator.hours_remaining is None
+
+    # Steady percentage has no estimate
+    estimator.add(50, 0, 300)
+    assert estimator.hours_remaining is None
+
+    # 1% per minute while charging, the steady readings drop out
+    for minute in range(6, 30):
+        estimator.add(50 + minute - 6, 0, minute * 60)
+    assert estimator.hours_remaining == pytest.approx((100 - 73) / 60)
+    assert len(estimator._readings) == 11
+
+    estimator.clear()
+    assert estimator.hours_remaining is None
@@ -0,0 +1,132 @@
+"""Test the telemetry history for SolixBLE integration."""
+
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from custom_components.solix_ble.const import DOMAIN
+from custom_components.solix_ble.history import SolixBLEHistory
+
+from . import (
+    MOCK_C300_DETAILS,
+    MOCK_C1000_DETAILS,
+    MockDeviceDetails,
+    patch_connection,
+)
+
+
+def test_history_ring_buffer() -> None:
+    """Test that the oldest rows are overwritten and ranges can be queried."""
+
+    snapshot = {"power_out": 0, "battery_percentage": None}
+    dispatcher = MagicMock(available=True)
+    dispatcher.get.side_effect = snapshot.get
+    history = SolixBLEHistory(dispatcher, ("power_out", "battery_percentage"), 3)
+    history.async_start()
+    assert dispatcher.async_subscribe.call_count == 2
+
+    now = 100
+    with patch("custom_components.solix_ble.history.time", side_effect=lambda: now):
+        for now in range(100, 105):
+            snapshot["power_out"] = now * 2.5
+            history._async_add_row()
+
+    assert history.query() == {
+        "time": [102, 103, 104],
+        "values": {
+            "power_out": [255, 257.5, 260],
+            "battery_percentage": [None, None, None],
+        },
+    }
+    assert history.query(103, 103.5, ["power_out", "unknown"]) == {
+        "time": [103],
+        "values": {"power_out": [257.5]},
+    }
+    assert history.query(start_time=200)["time"] == []
+
+    history.async_stop()
+    dispatcher.async_subscribe.return_value.assert_called()
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_history_websocket(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that the history is returned through the websocket API."""
+
+    mock_config_entry.add_to_hass(hass)
+    with (
+        patch_connection(mock_device_details) as connection,
+        patch(
+            "SolixBLE.C300.power_out",
+            new_callable=PropertyMock,
+            return_value=None,
+        ) as mock_power_out,
+    ):
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+
+        client = await hass_ws_client(hass)
+        await client.send_json_auto_id(
+            {
+                "type": f"{DOMAIN}/history",
+                "entry_id": mock_config_entry.entry_id,
+                "attributes": ["power_out"],
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        assert response["result"] == {"time": [], "values": {"power_out": []}}
+
+        # A row is added for each packet
+        mock_power_out.return_value = 120
+        connection.update()
+        await hass.async_block_till_done()
+        await client.send_json_auto_id(
+            {"type": f"{DOMAIN}/history", "entry_id": mock_config_entry.entry_id}
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        assert len(response["result"]["time"]) == 1
+        assert response["result"]["values"]["power_out"] == [120]
+        assert "battery_percentage" in response["result"]["values"]
+
+        await client.send_json_auto_id(
+            {"type": f"{DOMAIN}/history", "entry_id": "unknown"}
+        )
+        response = await client.receive_json()
+        assert not response["success"]
+        assert response["error"]["code"] == "not_found"
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C1000_DETAILS, MOCK_C1000_DETAILS, id="c1000")],
+    indirect=["mock_config_entry"],
+)
+async def test_history_attributes(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that static attributes are left out of the history."""
+
+    mock_config_entry.add_to_hass(hass)
+    with patch_connection(mock_device_details):
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+
+        attributes = mock_config_entry.runtime_data.history.attributes
+        assert "battery_percentage" in attributes
+        assert "num_expansion" not in attributes
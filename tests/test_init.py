@@ -2,12 +2,15 @@
 
 import asyncio
 from datetime import timedelta
+from typing import Any
 from unittest.mock import PropertyMock, patch
 
 import pytest
 from bleak.backends.device import BLEDevice
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt
 from pytest_homeassistant_custom_component.common import async_fire_time_changed
@@ -83,17 +86,6 @@ async def test_setup(
 @pytest.mark.parametrize(
     "mock_config_entry,mock_device_details,ble_device,scanner_count,connect,connected,negotiated,error",
     [
-        pytest.param(
-            MOCK_C300_DETAILS,
-            MOCK_C300_DETAILS,
-            None,
-            1,
-            True,
-            True,
-            True,
-            "The device was not found",
-            id="not_found",
-        ),
         pytest.param(
             MOCK_C300_DETAILS,
             MOCK_C300_DETAILS,
@@ -105,11 +97,154 @@ async def test_setup(
             "No Bluetooth scanners",
             id="no_scanners",
         ),
+    ],
+    indirect=["mock_config_entry"],
+)
+async def test_setup_error(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+    ble_device: BLEDevice | None,
+    scanner_count: int,
+    connect: Exception | bool,
+    connected: bool,
+    negotiated: bool,
+    error: str,
+) -> None:
+    """Test that ConfigEntryNotReady is raised if there is an error condition."""
+
+    # First we test with a problem
+    mock_config_entry.add_to_hass(hass)
+    with (
+        patch(
+            "custom_components.solix_ble.async_ble_device_from_address",
+            return_value=ble_device,
+        ),
+        patch(
+            "custom_components.solix_ble.async_scanner_count",
+            return_value=scanner_count,
+        ),
+        patch(
+            "SolixBLE.SolixBLEDevice.connect",
+            side_effect=[connect],
+        ),
+        patch(
+            "SolixBLE.SolixBLEDevice.connected",
+            new_callable=PropertyMock,
+            return_value=connected,
+        ),
+        patch(
+            "SolixBLE.SolixBLEDevice.negotiated",
+            new_callable=PropertyMock,
+            return_value=negotiated,
+        ),
+    ):
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+        assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+        assert error in caplog.text
+
+    # Then we test when that problem is gone to make sure it still works
+    # and nothing wonky has happened to the internal state
+    with (
+        patch(
+            "custom_components.solix_ble.async_ble_device_from_address",
+            return_value=mock_device_details.get_ble_device(),
+        ),
+        patch(
+            "custom_components.solix_ble.async_scanner_count",
+            return_value=1,
+        ),
+        patch(
+            "SolixBLE.SolixBLEDevice.connect",
+            side_effect=[True],
+        ),
+        patch(
+            "SolixBLE.SolixBLEDevice.connected",
+            side_effect=[True],
+        ),
+        patch(
+            "SolixBLE.SolixBLEDevice.negotiated",
+            side_effect=[True],
+        ),
+    ):
+        # Try again
+        next_retry = dt.utcnow() + timedelta(seconds=150)  # Default initial backoff
+        async_fire_time_changed(hass, next_retry)
+        await hass.async_block_till_done()
+        await asyncio.sleep(0.2)
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_setup_not_found(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that a device which is out of range is connected to once heard."""
+
+    mock_config_entry.add_to_hass(hass)
+    with (
+        patch(
+            "custom_components.solix_ble.async_ble_device_from_address",
+            return_value=None,
+        ),
+        patch(
+            "custom_components.solix_ble.async_scanner_count",
+            return_value=1,
+        ),
+        patch(
+            "SolixBLE.SolixBLEDevice.connect",
+            side_effect=[True],
+        ) as mock_connect,
+        patch(
+            "SolixBLE.SolixBLEDevice.connected",
+            new_callable=PropertyMock,
+            return_value=False,
+        ) as mock_connected,
+        patch(
+            "SolixBLE.SolixBLEDevice.negotiated",
+            new_callable=PropertyMock,
+            return_value=False,
+        ) as mock_negotiated,
+    ):
+        # Entities are added as unavailable without trying to connect
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        entities = er.async_entries_for_config_entry(
+            er.async_get(hass), mock_config_entry.entry_id
+        )
+        assert entities
+        for entity in entities:
+            if entity.entity_category is None and entity.disabled_by is None:
+                assert hass.states.get(entity.entity_id).state == STATE_UNAVAILABLE
+        mock_connect.assert_not_called()
+
+        # The first advertisement supplies the device to connect through
+        service_info = mock_device_details.get_service_info()
+        supervisor = mock_config_entry.runtime_data.supervisor
+        supervisor.async_advertisement_received(service_info, None)
+        mock_connected.return_value = True
+        mock_negotiated.return_value = True
+        await asyncio.sleep(0.1)
+        await hass.async_block_till_done()
+        mock_connect.assert_called_once()
+        assert supervisor.device._ble_device is service_info.device
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details,connect,connected,negotiated,error",
+    [
         pytest.param(
             MOCK_UNKNOWN_DETAILS,
             MOCK_UNKNOWN_DETAILS,
-            MOCK_UNKNOWN_DETAILS.get_ble_device(),
-            1,
             False,
             False,
             True,
@@ -119,86 +254,105 @@ async def test_setup(
         pytest.param(
             MOCK_C300_DETAILS,
             MOCK_C300_DETAILS,
-            MOCK_C300_DETAILS.get_ble_device(),
-            1,
             Exception("Something went wrong"),
-            True,
-            True,
+            False,
+            False,
             "Unexpected exception when connecting to device",
             id="connect_exception",
         ),
         pytest.param(
             MOCK_C300_DETAILS,
             MOCK_C300_DETAILS,
-            MOCK_C300_DETAILS.get_ble_device(),
-            1,
-            Exception("Something went wrong"),
+            True,
             False,
             True,
-            "Unexpected exception when connecting to device",
+            "found but unable to connect",
             id="connected_false",
         ),
         pytest.param(
             MOCK_C300_DETAILS,
             MOCK_C300_DETAILS,
-            MOCK_C300_DETAILS.get_ble_device(),
-            1,
             True,
             True,
             False,
-            "Device connected but failed to negotiate encryption",
+            "connected but failed to negotiate encryption",
             id="negotiated_false",
         ),
     ],
     indirect=["mock_config_entry"],
 )
-async def test_setup_error(
+async def test_setup_connect_error(
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
     mock_config_entry: MockConfigEntry,
     mock_device_details: MockDeviceDetails,
-    ble_device: BLEDevice | None,
-    scanner_count: int,
     connect: Exception | bool,
     connected: bool,
     negotiated: bool,
     error: str,
 ) -> None:
-    """Test that ConfigEntryNotReady is raised if there is an error condition."""
+    """Test that entities are added straight away and connecting is retried."""
 
-    # First we test with a problem
     mock_config_entry.add_to_hass(hass)
     with (
         patch(
             "custom_components.solix_ble.async_ble_device_from_address",
-            return_value=ble_device,
+            return_value=mock_device_details.get_ble_device(),
         ),
         patch(
             "custom_components.solix_ble.async_scanner_count",
-            return_value=scanner_count,
+            return_value=1,
         ),
+        patch("custom_components.solix_ble.supervisor.CONNECT_RETRY_DELAY_MIN", 0.01),
         patch(
             "SolixBLE.SolixBLEDevice.connect",
-            side_effect=[connect],
-        ),
+            side_effect=[connect, True],
+        ) as mock_connect,
         patch(
             "SolixBLE.SolixBLEDevice.connected",
             new_callable=PropertyMock,
             return_value=connected,
-        ),
+        ) as mock_connected,
         patch(
             "SolixBLE.SolixBLEDevice.negotiated",
             new_callable=PropertyMock,
             return_value=negotiated,
-        ),
+        ) as mock_negotiated,
+        patch("SolixBLE.SolixBLEDevice.disconnect") as mock_disconnect,
     ):
+        # The failed attempt happens in the background
         assert await async_setup_component(hass, DOMAIN, {}) is True
         await hass.async_block_till_done()
-        assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(hass), mock_config_entry.entry_id
+        ):
+            if entity.entity_category is None and entity.disabled_by is None:
+                assert hass.states.get(entity.entity_id).state == STATE_UNAVAILABLE
         assert error in caplog.text
+        mock_disconnect.assert_called_once()
 
-    # Then we test when that problem is gone to make sure it still works
-    # and nothing wonky has happened to the internal state
+        # The next attempt succeeds
+        mock_connected.return_value = True
+        mock_negotiated.return_value = True
+        await asyncio.sleep(0.2)
+        await hass.async_block_till_done()
+        assert mock_connect.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_unload(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that the config entry unloads and disconnects from the device."""
+
+    mock_config_entry.add_to_hass(hass)
     with (
         patch(
             "custom_components.solix_ble.async_ble_device_from_address",
@@ -220,10 +374,62 @@ async def test_setup_error(
             "SolixBLE.SolixBLEDevice.negotiated",
             side_effect=[True],
         ),
+        patch("SolixBLE.SolixBLEDevice.disconnect") as mock_disconnect,
     ):
-        # Try again
-        next_retry = dt.utcnow() + timedelta(seconds=150)  # Default initial backoff
-        async_fire_time_changed(hass, next_retry)
+        assert await async_setup_component(hass, DOMAIN, {}) is True
         await hass.async_block_till_done()
-        await asyncio.sleep(0.2)
         assert mock_config_entry.state is ConfigEntryState.LOADED
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+        mock_disconnect.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_cached_device_info(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that device information is known from the cache before connecting."""
+
+    mock_config_entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {"static": {"serial_number": "ABC123", "software_version": "1.2"}},
+    }
+    with (
+        patch(
+            "custom_components.solix_ble.async_ble_device_from_address",
+            return_value=mock_device_details.get_ble_device(),
+        ),
+        patch(
+            "custom_components.solix_ble.async_scanner_count",
+            return_value=1,
+        ),
+        patch("SolixBLE.SolixBLEDevice.connect", return_value=False),
+        patch(
+            "SolixBLE.SolixBLEDevice.connected",
+            new_callable=PropertyMock,
+            return_value=False,
+        ),
+        patch("SolixBLE.SolixBLEDevice.disconnect"),
+    ):
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+
+        device = dr.async_get(hass).async_get_device(
+            connections={(dr.CONNECTION_BLUETOOTH, mock_device_details.addr)}
+        )
+        assert device is not None
+        assert device.serial_number == "ABC123"
+        assert device.sw_version == "1.2"
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
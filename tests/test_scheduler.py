@@ -0,0 +1,113 @@
+"""Test the connection slot scheduler for SolixBLE integration."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.solix_ble.scheduler import async_get_scheduler
+
+ADDRESS_1 = "AA:BB:CC:DD:EE:01"
+ADDRESS_2 = "AA:BB:CC:DD:EE:02"
+
+
+def _scanner_device(source: str, rssi: int, free: int | None) -> MagicMock:
+    """Return a device as heard by an adapter with a number of free slots."""
+    scanner_device = MagicMock()
+    scanner_device.scanner.source = source
+    scanner_device.advertisement.rssi = rssi
+    if free is None:
+        scanner_device.scanner.get_allocations.return_value = None
+    else:
+        scanner_device.scanner.get_allocations.return_value.free = free
+    return scanner_device
+
+
+async def test_scheduler_serialises_attempts(hass: HomeAssistant) -> None:
+    """Test that devices connect one at a time in the order they asked."""
+
+    scheduler = async_get_scheduler(hass)
+    assert async_get_scheduler(hass) is scheduler
+
+    with patch(
+        "custom_components.solix_ble.scheduler.async_scanner_devices_by_address",
+        return_value=[],
+    ):
+        first = hass.async_create_task(scheduler.async_acquire(ADDRESS_1))
+        second = hass.async_create_task(scheduler.async_acquire(ADDRESS_2))
+        await asyncio.sleep(0)
+        assert first.done()
+        assert await first is None
+        assert not second.done()
+
+        scheduler.async_attempt_finished(ADDRESS_1, True)
+        await asyncio.sleep(0)
+        assert second.done()
+        scheduler.async_attempt_finished(ADDRESS_2, True)
+
+
+async def test_scheduler_prefers_best_free_adapter(hass: HomeAssistant) -> None:
+    """Test that the adapter with the best RSSI and a free slot is chosen."""
+
+    scheduler = async_get_scheduler(hass)
+    near_full = _scanner_device("near", -50, 0)
+    far = _scanner_device("far", -80, 1)
+    unknown = _scanner_device("unknown", -90, None)
+
+    with patch(
+        "custom_components.solix_ble.scheduler.async_scanner_devices_by_address",
+        return_value=[unknown, near_full, far],
+    ):
+        assert await scheduler.async_acquire(ADDRESS_1) is far.ble_device
+        scheduler.async_attempt_finished(ADDRESS_1, True)
+
+    # Adapters which do not report their slots are assumed to have three
+    with patch(
+        "custom_components.solix_ble.scheduler.async_scanner_devices_by_address",
+        return_value=[unknown],
+    ):
+        for index in range(2):
+            address = f"AA:BB:CC:DD:EE:1{index}"
+            assert await scheduler.async_acquire(address) is unknown.ble_device
+            scheduler.async_attempt_finished(address, True)
+
+        # A device connected by the config flow uses a slot as well
+        scheduler.async_mark_connected("AA:BB:CC:DD:EE:12", "unknown")
+
+        waiting = hass.async_create_task(scheduler.async_acquire(ADDRESS_2))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+
+        # Freeing a slot lets the waiting device connect
+        scheduler.async_release("AA:BB:CC:DD:EE:10")
+        await asyncio.sleep(0)
+        assert await waiting is unknown.ble_device
+        scheduler.async_attempt_finished(ADDRESS_2, False)
+
+
+async def test_scheduler_skips_devices_which_cannot_connect(
+    hass: HomeAssistant,
+) -> None:
+    """Test that a device with full adapters does not hold up the others."""
+
+    scheduler = async_get_scheduler(hass)
+    full = _scanner_device("full", -50, 0)
+    free = _scanner_device("free", -50, 1)
+
+    with patch(
+        "custom_components.solix_ble.scheduler.async_scanner_devices_by_address",
+        side_effect=lambda hass, address, connectable: (
+            [full] if address == ADDRESS_1 else [free]
+        ),
+    ):
+        blocked = hass.async_create_task(scheduler.async_acquire(ADDRESS_1))
+        await asyncio.sleep(0)
+        assert await scheduler.async_acquire(ADDRESS_2) is free.ble_device
+        assert not blocked.done()
+
+        # Giving up while waiting removes the device from the queue
+        blocked.cancel()
+        await asyncio.sleep(0)
+        scheduler.async_attempt_finished(ADDRESS_2, True)
+        assert not scheduler._queue
+        assert scheduler._cancel_recheck is None
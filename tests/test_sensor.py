@@ -2,17 +2,41 @@
 
 import asyncio
 from contextlib import ExitStack
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any, Tuple, Union
 from unittest.mock import PropertyMock, patch
 
 import pytest
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant, State
 from homeassistant.setup import async_setup_component
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.util import dt
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    mock_restore_cache_with_extra_data,
+)
+import SolixBLE
 from SolixBLE import LightStatus, PortStatus
 
-from custom_components.solix_ble.const import DOMAIN
+from custom_components.solix_ble.const import (
+    ATTR_STALE,
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_PERCENT,
+    CONF_ESTIMATE_WINDOW,
+    CONF_POWER_WRITE_INTERVAL,
+    CONF_SENSOR_WRITE_INTERVAL,
+    DOMAIN,
+    ENERGY_UPDATE_INTERVAL,
+    ESTIMATE_SAMPLE_INTERVAL,
+    STATE_RESTORE_MAX_AGE,
+    STATE_SAVE_INTERVAL,
+)
+from custom_components.solix_ble.sensor import (
+    DERIVED_SENSORS_BY_MODEL,
+    SENSORS_BY_MODEL,
+    _get_converter,
+)
 
 from . import (
     MOCK_C300_DETAILS,
@@ -29,6 +53,7 @@ from . import (
     MOCK_UNKNOWN_DETAILS,
     MOCK_UNKNOWN_TEST_DATA,
     MockDeviceDetails,
+    patch_connection,
 )
 
 
@@ -176,3 +201,534 @@ async def test_sensor_entities(
             assert (
                 f"{entity.state}" == value
             ), f"Expected to find '{value}' at '{entity_id}' but instead the entity was '{entity.state}'!"
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_sensor_unchanged_state_not_written(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that only entities whose state changed are written on a state update."""
+
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch_connection(mock_device_details) as connection,
+        patch(
+            "SolixBLE.C300.battery_percentage",
+            new_callable=PropertyMock,
+            return_value=50,
+        ) as mock_battery_percentage,
+        patch(
+            "SolixBLE.C300.power_out",
+            new_callable=PropertyMock,
+            return_value=100,
+        ),
+    ):
+
+        # Set up the integration
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+
+        prefix = f"sensor.{mock_config_entry.title.lower().replace(" ", "_")}"
+        battery_before = hass.states.get(f"{prefix}_battery_percentage")
+        power_before = hass.states.get(f"{prefix}_total_power_out")
+        assert battery_before.state == "50"
+        assert power_before.state == "100"
+
+        # HA updates the reported timestamp of unchanged states in place
+        battery_reported = battery_before.last_reported
+        power_reported = power_before.last_reported
+
+        # Only the battery percentage changes
+        mock_battery_percentage.return_value = 51
+        connection.update()
+        await hass.async_block_till_done()
+
+        battery_after = hass.states.get(f"{prefix}_battery_percentage")
+        power_after = hass.states.get(f"{prefix}_total_power_out")
+        assert battery_after.state == "51"
+        assert battery_after.last_reported > battery_reported
+
+        # The power state must not have been re-written
+        assert power_after.state == "100"
+        assert power_after.last_reported == power_reported
+
+        # Updates leaving the state unchanged are counted
+        battery = hass.data[SENSOR_DOMAIN].get_entity(f"{prefix}_battery_percentage")
+        dispatcher = mock_config_entry.runtime_data.dispatcher
+        suppressed_writes = dispatcher.suppressed_writes
+        battery._state_change_callback()
+        assert battery.suppressed_writes == 1
+        assert dispatcher.suppressed_writes == suppressed_writes + 1
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_sensor_restored_state(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that the last known states are shown as stale until the device is available."""
+
+    mock_config_entry.add_to_hass(hass)
+    storage_key = f"{DOMAIN}.{mock_config_entry.entry_id}"
+    saved_at = (dt.utcnow() - timedelta(hours=1)).isoformat()
+    expired_at = (
+        dt.utcnow() - timedelta(seconds=STATE_RESTORE_MAX_AGE + 1)
+    ).isoformat()
+    hass_storage[storage_key] = {
+        "version": 1,
+        "key": storage_key,
+        "data": {
+            "static": {},
+            "states": {
+                "battery_percentage": {"state": 42, "saved_at": saved_at},
+                "ac_timer": {
+                    "state": "2026-01-01T12:00:00+00:00",
+                    "saved_at": saved_at,
+                },
+                "power_out": {"state": 120, "saved_at": expired_at},
+                "removed_sensor": {"state": 1, "saved_at": saved_at},
+            },
+        },
+    }
+
+    with (
+        patch_connection(mock_device_details, available=False) as connection,
+        patch(
+            "SolixBLE.C300.battery_percentage",
+            new_callable=PropertyMock,
+            return_value=50,
+        ),
+    ):
+
+        # Set up the integration
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+
+        prefix = f"sensor.{mock_config_entry.title.lower().replace(" ", "_")}"
+        battery = hass.states.get(f"{prefix}_battery_percentage")
+        assert battery.state == "42"
+        assert battery.attributes[ATTR_STALE] is True
+        ac_timer = hass.states.get(f"{prefix}_ac_timer")
+        assert ac_timer.state == "2026-01-01T12:00:00+00:00"
+        assert ac_timer.attributes[ATTR_STALE] is True
+
+        # Sensors without a recent last known state are unavailable
+        assert hass.states.get(f"{prefix}_total_power_out").state == "unavailable"
+
+        # The live state replaces the stale one once available
+        connection.available.return_value = True
+        connection.update()
+        await hass.async_block_till_done()
+        battery = hass.states.get(f"{prefix}_battery_percentage")
+        assert battery.state == "50"
+        assert ATTR_STALE not in battery.attributes
+
+        # And is saved for the next restart
+        async_fire_time_changed(
+            hass, dt.utcnow() + timedelta(seconds=STATE_SAVE_INTERVAL + 1)
+        )
+        await hass.async_block_till_done()
+        states = hass_storage[storage_key]["data"]["states"]
+        assert states["battery_percentage"]["state"] == 50
+        assert states["battery_percentage"]["saved_at"] != saved_at
+
+        # States of entities which no longer exist are dropped
+        assert "removed_sensor" not in states
+
+
+def test_sensor_descriptions() -> None:
+    """Test that every described sensor exists on the models it is used for."""
+
+    for model, descriptions in SENSORS_BY_MODEL.items():
+        keys = [description.key for description in descriptions]
+        assert len(keys) == len(set(keys)), f"Duplicate sensors for '{model}'!"
+
+        for description in descriptions:
+            assert isinstance(
+                getattr(model, description.key, None), property
+            ), f"'{model.__name__}' has no attribute '{description.key}'!"
+
+        # Derived sensors have at least one input the model has a sensor for
+        for description in DERIVED_SENSORS_BY_MODEL[model]:
+            assert set(description.inputs) & set(keys), description.key
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_sensor_write_throttling(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that the write interval and deadband defer writes until the trailing edge."""
+
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={
+            CONF_POWER_WRITE_INTERVAL: 10,
+            CONF_SENSOR_WRITE_INTERVAL: 0,
+            CONF_DEADBAND_ABSOLUTE: 5,
+            CONF_DEADBAND_PERCENT: 0,
+        },
+    )
+
+    with (
+        patch_connection(mock_device_details) as connection,
+        patch(
+            "SolixBLE.C300.power_out",
+            new_callable=PropertyMock,
+            return_value=100,
+        ) as mock_power_out,
+        patch(
+            "SolixBLE.C300.battery_percentage",
+            new_callable=PropertyMock,
+            return_value=50,
+        ) as mock_battery_percentage,
+    ):
+
+        # Set up the integration
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+
+        prefix = f"sensor.{mock_config_entry.title.lower().replace(" ", "_")}"
+        power_entity_id = f"{prefix}_total_power_out"
+        battery_entity_id = f"{prefix}_battery_percentage"
+        assert hass.states.get(power_entity_id).state == "100"
+
+        # Change within the deadband is deferred
+        mock_power_out.return_value = 103
+        connection.update()
+        await hass.async_block_till_done()
+        assert hass.states.get(power_entity_id).state == "100"
+
+        # Change outside of the deadband but inside the interval is deferred
+        mock_power_out.return_value = 120
+        connection.update()
+        await hass.async_block_till_done()
+        assert hass.states.get(power_entity_id).state == "100"
+
+        # Sensors without an interval are written straight away
+        mock_battery_percentage.return_value = 60
+        connection.update()
+        await hass.async_block_till_done()
+        assert hass.states.get(battery_entity_id).state == "60"
+
+        # The latest value is written on the trailing edge
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=11))
+        await hass.async_block_till_done()
+        assert hass.states.get(power_entity_id).state == "120"
+
+        # Deferred writes are not counted as suppressed
+        power = hass.data[SENSOR_DOMAIN].get_entity(power_entity_id)
+        assert power.suppressed_writes == 0
+
+
+def test_sensor_converters() -> None:
+    """Test that each sensor gets a converter matching its device class."""
+
+    descriptions = {
+        description.key: description for description in SENSORS_BY_MODEL[SolixBLE.C300]
+    }
+
+    convert = _get_converter(descriptions["ac_output"])
+    assert convert(PortStatus.OUTPUT) == "Output"
+    assert convert(PortStatus.UNKNOWN) == "Unknown"
+    assert convert(None) is None
+
+    convert = _get_converter(descriptions["ac_timer"])
+    timestamp = datetime.now(UTC)
+    assert convert(timestamp) == timestamp
+    assert convert(timestamp).tzinfo is not None
+    assert convert(None) is None
+
+    convert = _get_converter(descriptions["power_out"])
+    assert convert(12) == 12
+    assert convert(None) is None
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_sensor_energy(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that power is integrated into energy on top of the restored total."""
+
+    mock_config_entry.add_to_hass(hass)
+
+    prefix = f"sensor.{mock_config_entry.title.lower().replace(" ", "_")}"
+    energy_entity_id = f"{prefix}_total_energy_out"
+    mock_restore_cache_with_extra_data(
+        hass,
+        (
+            (
+                State(energy_entity_id, "1.5"),
+                {"native_value": 1.5, "native_unit_of_measurement": "kWh"},
+            ),
+        ),
+    )
+
+    now = 0
+
+    with (
+        patch_connection(mock_device_details) as connection,
+        patch(
+            "SolixBLE.C300.power_out",
+            new_callable=PropertyMock,
+            return_value=100,
+        ) as mock_power_out,
+        patch(
+            "SolixBLE.C300.connected",
+            new_callable=PropertyMock,
+            return_value=True,
+        ) as mock_connected,
+        patch(
+            "custom_components.solix_ble.sensor.monotonic",
+            side_effect=lambda: now,
+        ),
+    ):
+
+        # Set up the integration
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+        assert hass.states.get(energy_entity_id).state == "1.5"
+
+        # Trapezoid between the two readings
+        now = 36
+        mock_power_out.return_value = 300
+        connection.update()
+        await hass.async_block_till_done()
+        assert hass.states.get(energy_entity_id).state == "1.502"
+
+        # Steady power keeps being integrated
+        now = 72
+        async_fire_time_changed(
+            hass, dt.utcnow() + timedelta(seconds=ENERGY_UPDATE_INTERVAL + 1)
+        )
+        await hass.async_block_till_done()
+        assert hass.states.get(energy_entity_id).state == "1.505"
+
+        # Integrated up to the moment the connection is lost
+        now = 108
+        mock_connected.return_value = False
+        mock_config_entry.runtime_data.supervisor._async_disconnected()
+        await hass.async_block_till_done()
+        assert hass.states.get(energy_entity_id).state == "1.508"
+
+        # The held power is not integrated during the grace period
+        now = 200
+        async_fire_time_changed(
+            hass, dt.utcnow() + timedelta(seconds=2 * ENERGY_UPDATE_INTERVAL + 1)
+        )
+        await hass.async_block_till_done()
+        assert hass.states.get(energy_entity_id).state == "1.508"
+
+        # Nor is the gap once it has reconnected
+        now = 236
+        mock_connected.return_value = True
+        mock_config_entry.runtime_data.supervisor._async_connected()
+        await hass.async_block_till_done()
+        assert hass.states.get(energy_entity_id).state == "1.508"
+
+        now = 272
+        async_fire_time_changed(
+            hass, dt.utcnow() + timedelta(seconds=3 * ENERGY_UPDATE_INTERVAL + 1)
+        )
+        await hass.async_block_till_done()
+        assert hass.states.get(energy_entity_id).state == "1.511"
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_sensor_derived(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that derived sensors are calculated from the latest snapshot."""
+
+    mock_config_entry.add_to_hass(hass)
+
+    with ExitStack() as stack:
+        connection = stack.enter_context(patch_connection(mock_device_details))
+        readings = {
+            "power_in": 200,
+            "power_out": 50,
+            "ac_power_out": 25,
+            "usb_c1_power": 5,
+            "usb_c2_power": 10,
+            "usb_c3_power": 0,
+            "usb_a1_power": 10,
+        }
+        mocks = {
+            attribute: stack.enter_context(
+                patch(
+                    f"SolixBLE.C300.{attribute}",
+                    new_callable=PropertyMock,
+                    return_value=value,
+                )
+            )
+            for attribute, value in readings.items()
+        }
+
+        # Set up the integration
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+
+        prefix = f"sensor.{mock_config_entry.title.lower().replace(" ", "_")}"
+        assert hass.states.get(f"{prefix}_net_power").state == "150"
+        assert hass.states.get(f"{prefix}_total_usb_power").state == "25"
+        assert hass.states.get(f"{prefix}_ac_output_share").state == "50.0"
+
+        # Recalculated when any input changes
+        mocks["power_out"].return_value = 0
+        mocks["ac_power_out"].return_value = 0
+        connection.update()
+        await hass.async_block_till_done()
+        assert hass.states.get(f"{prefix}_net_power").state == "200"
+        assert hass.states.get(f"{prefix}_ac_output_share").state == "unknown"
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_sensor_estimate(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that the remaining time is estimated from the recent readings."""
+
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={CONF_ESTIMATE_WINDOW: 600},
+    )
+
+    prefix = f"sensor.{mock_config_entry.title.lower().replace(" ", "_")}"
+    hours_entity_id = f"{prefix}_estimated_remaining_time"
+    timestamp_entity_id = f"{prefix}_estimated_timestamp_remaining"
+    now = 0
+
+    with (
+        patch_connection(mock_device_details) as connection,
+        patch(
+            "SolixBLE.C300.battery_percentage",
+            new_callable=PropertyMock,
+            return_value=50,
+        ) as mock_battery_percentage,
+        patch(
+            "SolixBLE.C300.power_out",
+            new_callable=PropertyMock,
+            return_value=100,
+        ),
+        patch(
+            "custom_components.solix_ble.sensor.monotonic",
+            side_effect=lambda: now,
+        ),
+    ):
+
+        # Set up the integration
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+        assert hass.states.get(hours_entity_id).state == "unknown"
+
+        # Discharging at 1% per minute
+        for minute in range(1, 11):
+            now = minute * 60
+            mock_battery_percentage.return_value = 50 - minute
+            connection.update()
+            await hass.async_block_till_done()
+        assert float(hass.states.get(hours_entity_id).state) == pytest.approx(
+            40 / 60, abs=0.05
+        )
+        assert hass.states.get(timestamp_entity_id).state != "unknown"
+
+        # A steady percentage is still counted while nothing is sent
+        now = 11 * 60
+        async_fire_time_changed(
+            hass, dt.utcnow() + timedelta(seconds=ESTIMATE_SAMPLE_INTERVAL + 1)
+        )
+        await hass.async_block_till_done()
+        assert float(hass.states.get(hours_entity_id).state) > 40 / 60
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_F3800_DETAILS, MOCK_F3800_DETAILS, id="f3800")],
+    indirect=["mock_config_entry"],
+)
+async def test_sensor_efficiency(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that efficiency is only calculated while the battery is the only path."""
+
+    mock_config_entry.add_to_hass(hass)
+    readings = {
+        "power_out": 90,
+        "battery_discharge_power": 100,
+        "battery_charge_power": 0,
+        "ac_power_in": 0,
+        "solar_power_in": 0,
+    }
+    with ExitStack() as stack:
+        connection = stack.enter_context(patch_connection(mock_device_details))
+        mocks = {
+            attribute: stack.enter_context(
+                patch(
+                    f"SolixBLE.F3800.{attribute}",
+                    new_callable=PropertyMock,
+                    return_value=value,
+                )
+            )
+            for attribute, value in readings.items()
+        }
+
+        # Set up the integration
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+
+        prefix = f"sensor.{mock_config_entry.title.lower().replace(" ", "_")}"
+        assert hass.states.get(f"{prefix}_discharge_efficiency").state == "90.0"
+        assert hass.states.get(f"{prefix}_charge_efficiency").state == "unknown"
+
+        # Charging from solar with nothing plugged in
+        for attribute, value in {
+            "power_out": 0,
+            "battery_discharge_power": 0,
+            "battery_charge_power": 450,
+            "solar_power_in": 500,
+        }.items():
+            mocks[attribute].return_value = value
+        connection.update()
+        await hass.async_block_till_done()
+        assert hass.states.get(f"{prefix}_discharge_efficiency").state == "unknown"
+        assert hass.states.get(f"{prefix}_charge_efficiency").state == "90.0"
@@ -0,0 +1,214 @@
+"""Test the long-term statistics of power for SolixBLE integration."""
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.solix_ble.const import CONF_POWER_STATISTICS, DOMAIN
+from custom_components.solix_ble.statistics import SolixBLEStatistics
+
+from . import MOCK_C300_DETAILS, MockDeviceDetails, patch_connection
+
+
+async def test_statistics_hourly(hass: HomeAssistant) -> None:
+    """Test that readings are aggregated into hourly statistics."""
+
+    snapshot = {"power_out": 100}
+    dispatcher = MagicMock(available=True)
+    dispatcher.device.address = "AA:BB:CC:DD:EE:FF"
+    dispatcher.get.side_effect = snapshot.get
+    now = 0
+
+    with (
+        patch(
+            "custom_components.solix_ble.statistics.monotonic",
+            side_effect=lambda: now,
+        ),
+        patch(
+            "custom_components.solix_ble.statistics.dt_util.utcnow",
+            return_value=datetime(2026, 1, 1, 12, 30, tzinfo=UTC),
+        ),
+        patch(
+            "custom_components.solix_ble.statistics.async_add_external_statistics"
+        ) as mock_add_statistics,
+    ):
+        statistics = SolixBLEStatistics(
+            hass, dispatcher, {"power_out": "Device Total Power Out"}
+        )
+        statistics.async_start()
+        update = dispatcher.async_subscribe.call_args.args[1]
+
+        # 100W for 10 minutes then 400W for 20 minutes
+        now = 600
+        snapshot["power_out"] = 400
+        update()
+
+        # Readings while unavailable are left out
+        now = 1800
+        dispatcher.available = False
+        update()
+        now = 3600
+        statistics._async_hour_passed(datetime(2026, 1, 1, 13, tzinfo=UTC))
+
+        metadata, rows = mock_add_statistics.call_args.args[1:]
+        assert metadata["statistic_id"] == "solix_ble:aabbccddeeff_power_out"
+        assert metadata["name"] == "Device Total Power Out"
+        assert list(rows) == [
+            {
+                "start": datetime(2026, 1, 1, 12, tzinfo=UTC),
+                "mean": 300,
+                "min": 100,
+                "max": 400,
+            }
+        ]
+
+        # Nothing is added for an hour without readings
+        mock_add_statistics.reset_mock()
+        statistics.async_stop()
+        mock_add_statistics.assert_not_called()
+        dispatcher.async_subscribe.return_value.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_statistics_reload(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that the hour so far is carried over when the entry is reloaded."""
+
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_POWER_STATISTICS: True}
+    )
+    hass.config.components.add("recorder")
+    hour_start = dt.utcnow().replace(minute=0, second=0, microsecond=0)
+    now = 0
+
+    with (
+        patch_connection(mock_device_details) as connection,
+        patch(
+            "SolixBLE.C300.power_out",
+            new_callable=PropertyMock,
+            return_value=100,
+        ) as mock_power_out,
+        patch(
+            "custom_components.solix_ble.statistics.monotonic",
+            side_effect=lambda: now,
+        ),
+        patch(
+            "custom_components.solix_ble.statistics.async_add_external_statistics"
+        ) as mock_add_statistics,
+    ):
+
+        # Set up the integration
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+        connection.update()
+        await hass.async_block_till_done()
+
+        # 100W for 10 minutes then 400W for 10 minutes before reloading
+        now = 600
+        mock_power_out.return_value = 400
+        connection.update()
+        await hass.async_block_till_done()
+
+        now = 1200
+        assert await hass.config_entries.async_reload(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        # Then 400W for the rest of the hour from the reading after it
+        mock_add_statistics.reset_mock()
+
+        now = 2400
+        async_fire_time_changed(hass, hour_start + timedelta(hours=1))
+        await hass.async_block_till_done()
+
+        rows = {
+            call.args[1]["statistic_id"]: list(call.args[2])
+            for call in mock_add_statistics.call_args_list
+        }
+        assert rows["solix_ble:aabbccddee00_power_out"] == [
+            {"start": hour_start, "mean": 325, "min": 100, "max": 400}
+        ]
+
+        # Unloaded while the recorder is still patched
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+async def test_statistics_restart_next_hour(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that an hour saved before a restart is added after it has ended."""
+
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_POWER_STATISTICS: True}
+    )
+    hass.config.components.add("recorder")
+    previous_start = dt.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=1
+    )
+
+    # Saved when Home Assistant stopped during the previous hour
+    storage_key = f"{DOMAIN}.{mock_config_entry.entry_id}"
+    hass_storage[storage_key] = {
+        "version": 1,
+        "key": storage_key,
+        "data": {
+            "static": {},
+            "states": {},
+            "statistics": {
+                "power_out": {
+                    "start": previous_start.isoformat(),
+                    "weighted_sum": 300000,
+                    "duration": 1200,
+                    "min": 100,
+                    "max": 400,
+                },
+            },
+        },
+    }
+
+    with (
+        patch_connection(mock_device_details),
+        patch(
+            "custom_components.solix_ble.statistics.async_add_external_statistics"
+        ) as mock_add_statistics,
+    ):
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+
+        rows = {
+            call.args[1]["statistic_id"]: list(call.args[2])
+            for call in mock_add_statistics.call_args_list
+        }
+        assert rows == {
+            "solix_ble:aabbccddee00_power_out": [
+                {"start": previous_start, "mean": 250, "min": 100, "max": 400}
+            ]
+        }
+
+        # Unloaded while the recorder is still patched
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
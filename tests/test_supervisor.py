@@ -0,0 +1,297 @@
+"""Test the connection supervisor for SolixBLE integration."""
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from homeassistant.components.bluetooth import BluetoothChange
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.solix_ble.const import DISCONNECT_GRACE_PERIOD, DOMAIN
+from custom_components.solix_ble.supervisor import SolixBLESupervisor
+
+
+class MockDevice:
+    """Minimal stand in for a device API object which can connect."""
+
+    def __init__(self, connect_results: list[bool]) -> None:
+        self.name = "Mock device"
+        self.address = "AA:BB:CC:DD:EE:FF"
+        self.connected = False
+        self.negotiated = False
+        self.connect_results = connect_results
+        self.available = False
+        self.connect_calls = 0
+        self.callbacks = []
+        self._disconnect_event = asyncio.Event()
+        self._auto_reconnect_task = None
+
+    def add_callback(self, function) -> None:
+        self.callbacks.append(function)
+
+    def remove_callback(self, function) -> None:
+        self.callbacks.remove(function)
+
+    def send_telemetry(self) -> None:
+        self.available = True
+        for function in self.callbacks:
+            function()
+
+    async def connect(self, run_callbacks: bool = True) -> bool:
+        self.connect_calls += 1
+        result = self.connect_results.pop(0) if self.connect_results else False
+        self.connected = self.negotiated = result
+        if result:
+            self._disconnect_event.clear()
+        return result
+
+    async def disconnect(self) -> None:
+        self.connected = self.negotiated = self.available = False
+
+    def lose_connection(self) -> None:
+        self.connected = self.negotiated = False
+        self._disconnect_event.set()
+
+
+def _make_supervisor(
+    hass: HomeAssistant, device: MockDevice, **kwargs: Any
+) -> tuple[SolixBLESupervisor, MagicMock]:
+    """Return a supervisor of the device along with its mock dispatcher."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    dispatcher = MagicMock(device=device)
+    return SolixBLESupervisor(hass, entry, dispatcher, **kwargs), dispatcher
+
+
+@patch("custom_components.solix_ble.supervisor.CONNECT_RETRY_DELAY_MIN", 0.01)
+async def test_supervisor_reconnects(hass: HomeAssistant) -> None:
+    """Test that the connection is retried and the health is recorded."""
+
+    device = MockDevice([False, True, False, True])
+    supervisor, _ = _make_supervisor(hass, device)
+    listener = MagicMock()
+    supervisor.async_add_listener(listener)
+
+    # First attempt fails and the second succeeds
+    supervisor.async_start()
+    await asyncio.sleep(0.1)
+    assert device.connect_calls == 2
+    assert device.negotiated
+    assert supervisor.last_connect_time is not None
+    assert supervisor.disconnects == 0
+    listener.assert_called_once()
+
+    # Losing the connection is counted and reconnects the same way
+    device.lose_connection()
+    await asyncio.sleep(0.1)
+    assert device.connect_calls == 4
+    assert device.negotiated
+    assert supervisor.disconnects == 1
+    assert supervisor.last_reconnect_time > 0
+    assert supervisor.unavailable_time == supervisor.last_reconnect_time
+    assert listener.call_count == 4
+
+    await supervisor.async_stop()
+
+
+@patch("custom_components.solix_ble.supervisor.CONNECT_RETRY_DELAY_MIN", 100)
+async def test_supervisor_wake(hass: HomeAssistant) -> None:
+    """Test that waking the supervisor retries straight away."""
+
+    device = MockDevice([False, True])
+    supervisor, dispatcher = _make_supervisor(hass, device)
+
+    supervisor.async_start()
+    await asyncio.sleep(0.05)
+    assert device.connect_calls == 1
+    dispatcher.async_reread_static.assert_not_called()
+
+    supervisor.async_wake()
+    await asyncio.sleep(0.05)
+    assert device.connect_calls == 2
+    assert device.negotiated
+
+    # Static attributes are read again after every connection
+    dispatcher.async_reread_static.assert_called_once()
+
+    await supervisor.async_stop()
+
+
+@patch("custom_components.solix_ble.supervisor.CONNECT_RETRY_DELAY_MIN", 100)
+async def test_supervisor_handed_off(hass: HomeAssistant) -> None:
+    """Test that a device connected by the config flow uses a connection slot."""
+
+    device = MockDevice([])
+    device.connected = device.negotiated = True
+    device._ble_device = MagicMock(details={"source": "hci0"})
+    supervisor, _ = _make_supervisor(hass, device)
+
+    supervisor.async_start(connected=True)
+    await asyncio.sleep(0.05)
+    assert supervisor.scheduler._sources == {device.address: "hci0"}
+
+    # And frees it once the connection is lost
+    device.lose_connection()
+    await asyncio.sleep(0.05)
+    assert device.address not in supervisor.scheduler._sources
+
+    await supervisor.async_stop()
+
+
+@patch("custom_components.solix_ble.supervisor.CONNECT_RETRY_DELAY_MIN", 100)
+async def test_supervisor_grace_period(hass: HomeAssistant) -> None:
+    """Test that entities are only made unavailable after the grace period."""
+
+    device = MockDevice([True])
+    supervisor, dispatcher = _make_supervisor(hass, device)
+
+    supervisor.async_start()
+    await asyncio.sleep(0.05)
+    device.lose_connection()
+    await asyncio.sleep(0.05)
+    dispatcher.async_refresh.assert_not_called()
+
+    async_fire_time_changed(
+        hass, dt.utcnow() + timedelta(seconds=DISCONNECT_GRACE_PERIOD + 1)
+    )
+    await hass.async_block_till_done()
+    dispatcher.async_refresh.assert_called_once()
+
+    await supervisor.async_stop()
+
+
+@patch("custom_components.solix_ble.supervisor.CONNECT_RETRY_DELAY_MIN", 100)
+async def test_supervisor_advertisement(hass: HomeAssistant) -> None:
+    """Test that the device advertising again retries straight away."""
+
+    device = MockDevice([False, False, True, False, True])
+    supervisor, _ = _make_supervisor(hass, device)
+    service_info = MagicMock(rssi=-70)
+    listener = MagicMock()
+    supervisor.async_add_listener(listener)
+
+    supervisor.async_start()
+    await asyncio.sleep(0.05)
+    assert device.connect_calls == 1
+
+    # Advertisements while it has not stopped advertising do not wake
+    supervisor.async_advertisement_received(service_info, BluetoothChange.ADVERTISEMENT)
+    await asyncio.sleep(0.05)
+    assert device.connect_calls == 1
+    assert device._ble_device is service_info.device
+
+    # The signal strength is known without connecting
+    assert supervisor.rssi == -70
+    listener.assert_called_once()
+
+    # The first advertisement after reappearing wakes
+    supervisor.async_device_unavailable(service_info)
+    assert supervisor.rssi is None
+    supervisor.async_advertisement_received(service_info, BluetoothChange.ADVERTISEMENT)
+    supervisor.async_advertisement_received(service_info, BluetoothChange.ADVERTISEMENT)
+    await asyncio.sleep(0.05)
+    assert device.connect_calls == 2
+
+    supervisor.async_device_unavailable(service_info)
+    supervisor.async_advertisement_received(service_info, BluetoothChange.ADVERTISEMENT)
+    await asyncio.sleep(0.05)
+    assert device.connect_calls == 3
+    assert device.negotiated
+
+    # Advertising again soon after losing the connection wakes, even though
+    # HA never noticed the device had stopped advertising
+    supervisor.async_advertisement_received(service_info, BluetoothChange.ADVERTISEMENT)
+    device.lose_connection()
+    await asyncio.sleep(0.05)
+    assert device.connect_calls == 4
+    supervisor.async_advertisement_received(service_info, BluetoothChange.ADVERTISEMENT)
+    await asyncio.sleep(0.05)
+    assert device.connect_calls == 5
+    assert device.negotiated
+
+    await supervisor.async_stop()
+
+
+@patch("custom_components.solix_ble.supervisor.SNAPSHOT_TIMEOUT", 0.05)
+async def test_supervisor_rotating(hass: HomeAssistant) -> None:
+    """Test that rotating mode disconnects after each snapshot."""
+
+    device = MockDevice([True, True])
+    supervisor, dispatcher = _make_supervisor(
+        hass, device, rotating=True, scan_interval=0.2
+    )
+
+    # Disconnects as soon as the telemetry arrives and keeps the snapshot
+    supervisor.async_start()
+    await asyncio.sleep(0.01)
+    assert device.connect_calls == 1
+    assert device.connected
+    device.send_telemetry()
+    await asyncio.sleep(0.01)
+    assert not device.connected
+    assert not device.callbacks
+    dispatcher.async_refresh.assert_not_called()
+
+    # Connects again after the scan interval, this time without telemetry
+    await asyncio.sleep(0.2)
+    assert device.connect_calls == 2
+    await asyncio.sleep(0.1)
+    assert not device.connected
+    dispatcher.async_refresh.assert_called_once()
+
+    await supervisor.async_stop()
+
+
+class FailingMockDevice(MockDevice):
+    """Mock device whose disconnect raises, like a proxy which has gone away."""
+
+    async def disconnect(self) -> None:
+        await super().disconnect()
+        raise ConnectionError("Proxy went away")
+
+
+@patch("custom_components.solix_ble.supervisor.CONNECT_RETRY_DELAY_MIN", 0.01)
+async def test_supervisor_errors(hass: HomeAssistant) -> None:
+    """Test that unexpected exceptions do not stop the supervisor."""
+
+    device = FailingMockDevice([False, True, True, True])
+    supervisor, _ = _make_supervisor(hass, device)
+
+    # Disconnecting after a failed attempt raises
+    supervisor.async_start()
+    await asyncio.sleep(0.1)
+    assert device.connect_calls == 2
+    assert device.negotiated
+
+    # Anything else going wrong is retried after a backoff
+    device.lose_connection()
+    with patch.object(
+        supervisor, "_async_connected", side_effect=[RuntimeError("Oops"), None]
+    ):
+        await asyncio.sleep(0.1)
+    assert device.connect_calls == 4
+    assert device.negotiated
+
+    await supervisor.async_stop()
+
+
+@patch("custom_components.solix_ble.supervisor.SNAPSHOT_TIMEOUT", 0.05)
+async def test_supervisor_rotating_errors(hass: HomeAssistant) -> None:
+    """Test that rotating mode carries on when disconnecting raises."""
+
+    device = FailingMockDevice([True, True])
+    supervisor, _ = _make_supervisor(hass, device, rotating=True, scan_interval=0.1)
+
+    supervisor.async_start()
+    await asyncio.sleep(0.01)
+    device.send_telemetry()
+    await asyncio.sleep(0.15)
+    assert device.connect_calls == 2
+
+    await supervisor.async_stop()
@@ -2,6 +2,7 @@
 
 import asyncio
 from contextlib import nullcontext
+from datetime import timedelta
 from typing import Any, Union
 from unittest.mock import PropertyMock, patch
 
@@ -16,18 +17,25 @@ from homeassistant.const import (
     STATE_UNKNOWN,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import async_setup_component
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.util import dt
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 from SolixBLE import PortStatus, SolixBLEDevice
 from sqlalchemy import union
 
 from custom_components.solix_ble.const import DOMAIN
+from custom_components.solix_ble.switch import SWITCHES_BY_MODEL
 
 from . import (
     MOCK_C300_DETAILS,
     MOCK_C800_DETAILS,
     MOCK_C1000_DETAILS,
     MockDeviceDetails,
+    patch_connection,
 )
 
 
@@ -239,20 +247,20 @@ async def test_switch_entities(
         )
         mock_on_function.assert_called_once()
 
-        # If we have a state attribute it should now be in the on position
+        # The new state is shown before the device reports it
+        assert (
+            hass.states.get(entity_id).state == STATE_ON
+        ), "Expected new state to be on!"
+
+        # If we have a state attribute the device confirms it
         if state_attribute:
             mock_state_attribute.return_value = on_off_sequence[1]
             captured_self._run_state_changed_callbacks()
+            await hass.async_block_till_done()
 
             assert (
                 hass.states.get(entity_id).state == STATE_ON
-            ), "Expected new state to be on!"
-
-        # Else it should remain in unknown position
-        else:
-            assert (
-                hass.states.get(entity_id).state == STATE_UNKNOWN
-            ), "Expected state to remain unknown!"
+            ), "Expected new state to stay on!"
 
         # Turn off
         await hass.services.async_call(
@@ -262,18 +270,115 @@ async def test_switch_entities(
             blocking=True,
         )
         mock_off_function.assert_called_once()
+        assert (
+            hass.states.get(entity_id).state == STATE_OFF
+        ), "Expected final state to be off!"
 
-        # If we have a state attribute it should now be in the off position
+        # If we have a state attribute the device confirms it
         if state_attribute:
             mock_state_attribute.return_value = on_off_sequence[2]
             captured_self._run_state_changed_callbacks()
+            await hass.async_block_till_done()
 
             assert (
                 hass.states.get(entity_id).state == STATE_OFF
-            ), "Expected final state to be off!"
+            ), "Expected final state to stay off!"
 
-        # Else it should remain in unknown position
-        else:
-            assert (
-                hass.states.get(entity_id).state == STATE_UNKNOWN
-            ), "Expected final state to remain unknown!"
+
+def test_switch_descriptions() -> None:
+    """Test that every described switch exists on the models it is used for."""
+
+    for model, descriptions in SWITCHES_BY_MODEL.items():
+        keys = [description.key for description in descriptions]
+        assert len(keys) == len(set(keys)), f"Duplicate switches for '{model}'!"
+
+        for description in descriptions:
+            if description.state_attribute is not None:
+                assert isinstance(
+                    getattr(model, description.state_attribute, None), property
+                )
+            assert callable(getattr(model, description.on_function, None))
+            assert callable(getattr(model, description.off_function, None))
+
+
+@pytest.mark.parametrize(
+    "mock_config_entry,mock_device_details",
+    [pytest.param(MOCK_C300_DETAILS, MOCK_C300_DETAILS, id="c300")],
+    indirect=["mock_config_entry"],
+)
+@patch("custom_components.solix_ble.switch.SWITCH_CONFIRMATION_TIMEOUT", 30)
+async def test_switch_confirmation(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+    mock_config_entry: MockConfigEntry,
+    mock_device_details: MockDeviceDetails,
+) -> None:
+    """Test that switching is confirmed by the device or rolled back."""
+
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch_connection(mock_device_details) as connection,
+        patch("SolixBLE.C300.ac_output", new_callable=PropertyMock) as mock_ac_output,
+        patch("SolixBLE.C300.turn_ac_on"),
+        patch("SolixBLE.C300.turn_ac_off", side_effect=ConnectionError("Lost")),
+    ):
+        assert await async_setup_component(hass, DOMAIN, {}) is True
+        await hass.async_block_till_done()
+        await asyncio.sleep(1)
+
+        entity_id = (
+            f"switch.{mock_config_entry.title.lower().replace(' ', '_')}_ac_output"
+        )
+        mock_ac_output.return_value = PortStatus.NOT_CONNECTED
+        connection.update()
+        await hass.async_block_till_done()
+        commands = mock_config_entry.runtime_data.supervisor.commands
+
+        # Shown straight away and kept while the device has not confirmed it
+        await hass.services.async_call(
+            SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True
+        )
+        connection.update()
+        await hass.async_block_till_done()
+        assert hass.states.get(entity_id).state == STATE_ON
+        assert commands.last_confirmation_latency is None
+
+        # Going back to the reported state if the device does not confirm
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=31))
+        await hass.async_block_till_done()
+        assert hass.states.get(entity_id).state == STATE_OFF
+
+        # Confirmed by the device
+        await hass.services.async_call(
+            SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True
+        )
+        mock_ac_output.return_value = PortStatus.OUTPUT
+        connection.update()
+        await hass.async_block_till_done()
+        assert commands.last_confirmation_latency is not None
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=62))
+        await hass.async_block_till_done()
+        assert hass.states.get(entity_id).state == STATE_ON
+
+        # Confirmed straight away if the device was already in that state
+        caplog.clear()
+        commands.last_confirmation_latency = None
+        await hass.services.async_call(
+            SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True
+        )
+        assert commands.last_confirmation_latency is not None
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=93))
+        await hass.async_block_till_done()
+        assert "did not report" not in caplog.text
+        assert hass.states.get(entity_id).state == STATE_ON
+
+        # Going back straight away if the command could not be sent
+        with pytest.raises(HomeAssistantError):
+            await hass.services.async_call(
+                SWITCH_DOMAIN,
+                SERVICE_TURN_OFF,
+                {ATTR_ENTITY_ID: entity_id},
+                blocking=True,
+            )
+        assert hass.states.get(entity_id).state == STATE_ON